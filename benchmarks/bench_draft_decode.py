@@ -0,0 +1,59 @@
+# JPEG 축소 디코딩(draft) 전/후의 이미지당 처리 시간과 최대 메모리(RSS) 비교
+#
+# 사용법: python benchmarks/bench_draft_decode.py [--megapixels 24] [--width 1024] [--count 3]
+# 측정값이 서로 섞이지 않도록 각 경우를 별도 프로세스에서 실행합니다.
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+
+from common import make_photo, peak_rss_mb
+import resizer_core
+
+
+def run_case(folder, width, draft):
+    """한 프로세스 안에서 폴더의 JPEG들을 처리하고 결과를 JSON으로 출력합니다."""
+    resizer_core.USE_JPEG_DRAFT = draft
+    files = sorted(os.path.join(folder, f) for f in os.listdir(folder) if f.endswith(".jpg"))
+    with tempfile.TemporaryDirectory() as output_folder:
+        start = time.perf_counter()
+        for input_file in files:
+            resizer_core.process_image_file(input_file, output_folder, width, 85, 300, "JPEG", 1)
+        elapsed = time.perf_counter() - start
+        print(json.dumps({"seconds_per_image": elapsed / len(files), "peak_rss_mb": peak_rss_mb()}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JPEG draft 디코딩 벤치마크")
+    parser.add_argument("--megapixels", type=float, default=24)
+    parser.add_argument("--width", type=int, default=1024, help="출력 최대 너비(px)")
+    parser.add_argument("--count", type=int, default=3, help="테스트 이미지 수")
+    parser.add_argument("--case", choices=["draft", "full"], help=argparse.SUPPRESS)
+    parser.add_argument("--folder", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        run_case(args.folder, args.width, args.case == "draft")
+        return
+
+    with tempfile.TemporaryDirectory() as folder:
+        w = int((args.megapixels * 1e6 * 3 / 2) ** 0.5)
+        h = w * 2 // 3
+        for i in range(args.count):
+            make_photo(w, h, seed=i).save(os.path.join(folder, f"{i}.jpg"), quality=92)
+        print(f"입력: {args.count}장, {w}x{h} ({w * h / 1e6:.1f} MP) JPEG -> 너비 {args.width}px")
+
+        for case, label in (("full", "전체 디코딩"), ("draft", "축소 디코딩")):
+            output = subprocess.run([sys.executable, __file__, "--case", case, "--folder", folder, "--width", str(args.width)],
+                                    capture_output=True, text=True, check=True).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            rss = result["peak_rss_mb"]
+            print(f"{label}: {result['seconds_per_image'] * 1000:.0f} ms/장, "
+                  f"최대 RSS {'N/A' if rss is None else f'{rss:.0f} MB'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+# 메모리 한도 스케줄러 확인: 큰 이미지와 작은 이미지가 섞인 입력을 병렬 처리하면서
+# 작업자 프로세스들의 메모리 사용량 합계를 측정하여, 한도를 지키는지와 한도가 없을 때와의 차이를 출력합니다.
+#
+# 사용법: python benchmarks/bench_memory_budget.py [--budget-mb 600] [--big-megapixels 40] [--jobs 4] [--check]
+# 먼저 예상 메모리 값을 정해 둔 가짜 작업으로 스케줄러가 작업을 넣는 방식(동시에 실행 중인 작업의 예상 메모리 합계)을
+# 확인하고, 이어서 실제 이미지로 측정합니다. --check이면 앞의 확인만 합니다. (이미지를 만들지 않아 빠름)
+# 어느 쪽이든 한도를 넘으면 종료 코드 1을 반환합니다. (작업자 메모리 측정은 psutil 또는 Linux /proc 필요)
+import os
+import sys
+import time
+import argparse
+import tempfile
+import threading
+import multiprocessing
+
+from common import make_alpha, make_photo
+import resizer_core
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+def rss_mb(pid):
+    """프로세스의 현재 메모리 사용량(RSS, MB) (측정할 수 없으면 None)"""
+    if psutil is not None:
+        try:
+            return psutil.Process(pid).memory_info().rss / (1024 * 1024)
+        except psutil.Error:
+            return None
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+    return None
+
+
+# 가짜 작업의 예상 메모리(MB): 작은 작업 여러 개, 중간 크기, 한도(100MB)보다 큰 작업이 섞인 순서
+CHECK_BUDGET_MB = 100
+CHECK_ESTIMATES_MB = [10] * 6 + [60, 10, 10, 150, 10, 40, 40, 40, 10, 90, 20, 5, 5, 5, 5, 120, 10, 10]
+
+
+def fake_process_image_file(input_file, output_folder, *options):
+    """작업자에서 실행되는 가짜 처리: 시작/끝 시각(모든 프로세스에 공통인 monotonic)을 파일로 남깁니다."""
+    start = time.monotonic()
+    time.sleep(0.05)
+    with open(os.path.join(output_folder, os.path.basename(input_file)), "w") as f:
+        f.write(f"{start} {time.monotonic()}")
+    return 'ok', 'ok', input_file, [], resizer_core.new_metrics()
+
+
+def running_estimates(folder, estimates):
+    """기록된 실행 구간으로, 각 작업이 시작할 때 동시에 실행 중이던 작업들의 예상 메모리(MB) 목록을 구합니다."""
+    intervals = []
+    for name in os.listdir(folder):
+        with open(os.path.join(folder, name)) as f:
+            start, end = (float(value) for value in f.read().split())
+        intervals.append((start, end, estimates[int(name)]))
+    return [[memory for s, e, memory in intervals if s <= start < e] for start, _, _ in intervals]
+
+
+def check_admission(jobs, budget_mb):
+    """예상 메모리를 정해 둔 가짜 작업들을 iter_image_results로 실행하여, 시점별 실행 중인 작업의 예상 메모리 목록을 반환합니다."""
+    original = resizer_core.process_image_file, resizer_core.estimate_image_memory
+    # 작업자는 fork로 만들어지므로 바꿔 둔 함수를 그대로 사용 (예상 메모리는 ImageInfo.file_size에 넣어 전달)
+    resizer_core.process_image_file = fake_process_image_file
+    resizer_core.estimate_image_memory = lambda info, max_width: info.file_size
+    try:
+        with tempfile.TemporaryDirectory() as folder:
+            plan = [resizer_core.PlanItem(str(i), folder, 'encode',
+                                          resizer_core.ImageInfo(100, 100, "JPEG", 1, "RGB", memory * 1024 * 1024), None)
+                    for i, memory in enumerate(CHECK_ESTIMATES_MB)]
+            options = (1024, 85, 300, "JPEG", 1, "fast", None, resizer_core.DEFAULT_COPY_STRATEGY)
+            order = [idx for idx, _, _, error in resizer_core.iter_image_results(plan, options, jobs,
+                                                                                  memory_budget_mb=budget_mb)
+                     if error is None]
+            assert order == list(range(len(plan))), f"결과 순서/누락 오류: {order}"
+            return running_estimates(folder, CHECK_ESTIMATES_MB)
+    finally:
+        resizer_core.process_image_file, resizer_core.estimate_image_memory = original
+
+
+def run_checks(jobs):
+    """스케줄러 확인: 한도가 있으면 동시에 실행 중인 예상 메모리 합계가 한도 이하이거나, 한도보다 큰 작업 하나뿐이어야 함"""
+    if multiprocessing.get_start_method() != "fork":
+        print("스케줄러 확인은 fork 방식의 프로세스 생성이 필요합니다. (Linux)")
+        return True
+
+    unlimited = max(sum(running) for running in check_admission(jobs, 0))
+    limited = check_admission(jobs, CHECK_BUDGET_MB)
+    print(f"스케줄러 확인 (가짜 작업 {len(CHECK_ESTIMATES_MB)}개, 작업자 {jobs}개): 동시에 실행 중인 예상 메모리 합계 최대 "
+          f"한도 없음 {unlimited}MB, 한도 {CHECK_BUDGET_MB}MB {max(sum(running) for running in limited)}MB")
+    exceeded = [running for running in limited if sum(running) > CHECK_BUDGET_MB and len(running) > 1]
+    if exceeded:
+        print(f"❌ 한도 초과: {exceeded[0]} (합계 {sum(exceeded[0])}MB)")
+        return False
+    if unlimited <= CHECK_BUDGET_MB:
+        print("❌ 한도 없이도 합계가 한도 이하라, 확인이 의미 없습니다. (작업자 수를 늘려 보세요)")
+        return False
+    print("✅ 스케줄러가 한도를 지킴 (한도보다 큰 작업은 혼자 실행)")
+    return True
+
+
+def make_inputs(folder, big_megapixels, small_count):
+    """큰 투명 PNG 2장, 큰 TIFF 2장과 작은 JPEG 여러 장을 섞어서 만듭니다. (큰 이미지가 중간중간 섞이도록 이름 순서 지정)"""
+    w = int((big_megapixels * 1e6 * 3 / 2) ** 0.5)
+    h = w * 2 // 3
+    photo = make_photo(w, h, seed=0)
+    make_alpha(w, h, seed=1).save(os.path.join(folder, "03-big-alpha.png"), compress_level=1)
+    make_alpha(w, h, seed=2).save(os.path.join(folder, "11-big-alpha.png"), compress_level=1)
+    photo.save(os.path.join(folder, "07-big.tif"))
+    photo.save(os.path.join(folder, "15-big.tif"))
+    small = make_photo(1600, 1200, seed=3)
+    for i in range(small_count):
+        small.save(os.path.join(folder, f"{i:02d}-small.jpg"), quality=90)
+
+
+def measure(folder, budget_mb, jobs, width):
+    """이미지를 처리하는 동안 작업자 메모리 증가량 합계의 최댓값(MB)과 걸린 시간(초)"""
+    with tempfile.TemporaryDirectory() as output_folder:
+        return measure_into(folder, output_folder, budget_mb, jobs, width)
+
+
+def measure_into(folder, output_folder, budget_mb, jobs, width):
+    files = [(input_file, output_folder) for input_file, _ in resizer_core.scan_image_files([folder])]
+    plan = list(resizer_core.plan_images(files, width, 300, "JPEG"))
+    options = (width, 85, 300, "JPEG", 1, "fast", None, resizer_core.DEFAULT_COPY_STRATEGY)
+    baseline = {}  # 작업자별 최소 RSS (Python/Pillow 로드와 부모 프로세스에서 물려받은 메모리)
+    peak = [0.0]
+    done = threading.Event()
+
+    def sample():
+        while not done.is_set():
+            total = 0.0
+            for child in multiprocessing.active_children():
+                rss = rss_mb(child.pid)
+                if rss is not None:
+                    baseline[child.pid] = min(baseline.get(child.pid, rss), rss)
+                    total += rss - baseline[child.pid]
+            peak[0] = max(peak[0], total)
+            time.sleep(0.01)
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    start = time.perf_counter()
+    for idx, input_file, result, error in resizer_core.iter_image_results(plan, options, jobs,
+                                                                         memory_budget_mb=budget_mb):
+        if error is not None:
+            raise error
+    elapsed = time.perf_counter() - start
+    done.set()
+    sampler.join()
+    largest = max(resizer_core.estimate_image_memory(item.info, width) for item in plan) / (1024 * 1024)
+    return peak[0], elapsed, largest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="메모리 한도 스케줄러 확인")
+    parser.add_argument("--budget-mb", type=int, default=600, help="메모리 한도(MB)")
+    parser.add_argument("--big-megapixels", type=float, default=40, help="큰 이미지 크기(MP)")
+    parser.add_argument("--small-count", type=int, default=16, help="작은 이미지 수")
+    parser.add_argument("--jobs", type=int, default=4)
+    parser.add_argument("--width", type=int, default=1024, help="출력 최대 너비(px)")
+    parser.add_argument("--check", action="store_true", help="가짜 작업으로 스케줄러만 확인 (이미지를 만들지 않음)")
+    args = parser.parse_args()
+
+    if not run_checks(args.jobs):
+        return 1
+    if args.check:
+        return 0
+
+    if rss_mb(os.getpid()) is None:
+        print("작업자 메모리를 측정할 수 없습니다. (psutil 또는 Linux /proc 필요)")
+        return 2
+
+    with tempfile.TemporaryDirectory() as folder:
+        make_inputs(folder, args.big_megapixels, args.small_count)
+        print(f"입력: {args.big_megapixels:g}MP 이미지 4장(투명 PNG, TIFF) + 1600x1200 JPEG {args.small_count}장, "
+              f"작업자 {args.jobs}개")
+
+        unlimited, unlimited_seconds, largest = measure(folder, 0, args.jobs, args.width)
+        limited, limited_seconds, _ = measure(folder, args.budget_mb, args.jobs, args.width)
+    print(f"가장 큰 이미지의 예상 메모리: {largest:.0f}MB")
+    print(f"한도 없음: 작업자 메모리 증가량 합계 최대 {unlimited:.0f}MB, {unlimited_seconds:.1f}초")
+    print(f"한도 {args.budget_mb}MB: 작업자 메모리 증가량 합계 최대 {limited:.0f}MB, {limited_seconds:.1f}초")
+
+    # 한도보다 큰 이미지는 혼자 처리하므로, 그 이미지의 예상 메모리까지는 허용
+    allowed = max(args.budget_mb, largest)
+    if limited > allowed:
+        print(f"❌ 한도 초과: {limited:.0f}MB > {allowed:.0f}MB")
+        return 1
+    print(f"✅ 한도 이내 ({limited:.0f}MB <= {allowed:.0f}MB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
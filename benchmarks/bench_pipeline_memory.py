@@ -0,0 +1,110 @@
+# 이미지 한 장 처리의 최대 메모리(RSS) 비교: 이전 파이프라인(회전 보정 → RGB 변환 → 리사이즈)과
+# 현재 파이프라인(리사이즈 → 회전 보정 → 인코더가 요구할 때만 변환)
+#
+# 사용법: python benchmarks/bench_pipeline_memory.py [--megapixels 24] [--width 1024]
+# 이미지마다 별도 프로세스에서 실행하여, 이미지당 최대 메모리가 서로 섞이지 않게 합니다.
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+
+from PIL import Image as PILImage, ImageOps
+
+from common import make_photo, peak_rss_mb
+import resizer_core
+
+# (파일 이름, 출력 형식, 설명)
+CASES = [
+    ("rotated.jpg", "JPEG", "세로 사진 JPEG(EXIF 회전) → JPEG"),
+    ("alpha.png", "WebP", "투명 PNG → WebP"),
+    ("alpha.png", "PNG", "투명 PNG → PNG"),
+    ("palette.png", "PNG", "팔레트 PNG → PNG"),
+    ("gray.tif", "TIFF", "흑백 TIFF → TIFF"),
+]
+
+
+def make_inputs(folder, megapixels):
+    w = int((megapixels * 1e6 * 3 / 2) ** 0.5)
+    h = w * 2 // 3
+    photo = make_photo(w, h, seed=0)
+
+    exif = PILImage.Exif()
+    exif[resizer_core.EXIF_ORIENTATION] = 6
+    photo.save(os.path.join(folder, "rotated.jpg"), quality=92, exif=exif.tobytes())
+
+    alpha = photo.convert("RGBA")
+    alpha.putalpha(PILImage.linear_gradient("L").resize((w, h)))
+    alpha.save(os.path.join(folder, "alpha.png"), compress_level=1)
+    photo.quantize(64).save(os.path.join(folder, "palette.png"), compress_level=1)
+    photo.convert("L").save(os.path.join(folder, "gray.tif"))
+    return w, h
+
+
+def legacy_process(input_file, output_folder, max_width, output_format):
+    """이전 파이프라인: 전체 크기로 회전 보정하고 RGB로 변환한 뒤 리사이즈 (이미지 크기의 복사본이 두 번 생김)"""
+    output_path = os.path.join(output_folder, os.path.basename(input_file))
+    with PILImage.open(input_file) as img:
+        resizer_core.draft_for_width(img, max_width)
+        img = ImageOps.exif_transpose(img)
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
+        img = resizer_core.resize_image_keep_ratio(img, max_width)
+        resizer_core.compress_and_save(img, output_path, output_format, 85, 300, 1)
+    return output_path
+
+
+def run_case(input_file, output_format, width, legacy):
+    """한 프로세스 안에서 이미지 한 장을 처리하고 결과를 JSON으로 출력합니다."""
+    with tempfile.TemporaryDirectory() as output_folder:
+        baseline = peak_rss_mb()
+        start = time.perf_counter()
+        if legacy:
+            output_path = legacy_process(input_file, output_folder, width, output_format)
+        else:
+            output_path = resizer_core.process_image_file(input_file, output_folder, width, 85, 300, output_format, 1)[2]
+        elapsed = time.perf_counter() - start
+        peak = peak_rss_mb()
+        with PILImage.open(output_path) as out:
+            mode = out.mode
+        print(json.dumps({"seconds": elapsed, "peak_rss_mb": peak, "baseline_mb": baseline, "mode": mode}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="처리 파이프라인 메모리 벤치마크")
+    parser.add_argument("--megapixels", type=float, default=24)
+    parser.add_argument("--width", type=int, default=1024, help="출력 최대 너비(px)")
+    parser.add_argument("--case", help=argparse.SUPPRESS)
+    parser.add_argument("--format", help=argparse.SUPPRESS)
+    parser.add_argument("--legacy", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        run_case(args.case, args.format, args.width, args.legacy)
+        return
+
+    with tempfile.TemporaryDirectory() as folder:
+        w, h = make_inputs(folder, args.megapixels)
+        print(f"입력: {w}x{h} ({w * h / 1e6:.1f} MP) -> 너비 {args.width}px, 이미지당 최대 RSS 증가량 (처리 전 대비)")
+
+        for name, output_format, label in CASES:
+            results = {}
+            for legacy in (True, False):
+                command = [sys.executable, __file__, "--case", os.path.join(folder, name), "--format", output_format,
+                           "--width", str(args.width)] + (["--legacy"] if legacy else [])
+                output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+                results[legacy] = json.loads(output.strip().splitlines()[-1])
+
+            def describe(result):
+                if result["peak_rss_mb"] is None:
+                    return f"{result['seconds'] * 1000:.0f} ms, RSS N/A, {result['mode']}"
+                return (f"{result['seconds'] * 1000:.0f} ms, +{result['peak_rss_mb'] - result['baseline_mb']:.0f} MB, "
+                        f"{result['mode']}")
+
+            print(f"{label}\n  이전: {describe(results[True])}\n  현재: {describe(results[False])}")
+
+
+if __name__ == "__main__":
+    main()
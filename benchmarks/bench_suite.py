@@ -0,0 +1,240 @@
+# 재현 가능한 합성 이미지 모음으로 일괄 처리 전체(process_images)를 측정하는 벤치마크
+#
+# 사용법: python benchmarks/bench_suite.py [--megapixels 2,12,24] [--count 2] [--formats jpeg,webp]
+#                                         [--output 결과.json] [--compare 이전결과.json]
+# 사진/그래픽/투명 PNG 합성 이미지를 고정된 seed로 만들고, 출력 형식 × 압축 모드마다 별도 프로세스에서 처리하여
+# 처리량(장/초, MP/초), 장당 인코딩 횟수(원본 크기/축소본 시험), 최대 메모리(RSS), 목표 용량 대비 출력 용량을 결과 파일(JSON)에 기록합니다.
+# 버전 사이의 성능 변화는 --compare로 이전 결과 파일과 비교합니다.
+# AVIF는 인코딩이 매우 느릴 수 있으므로, 빠르게 확인할 때는 --formats jpeg,png,webp처럼 형식을 줄여서 실행하세요.
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import platform
+import tempfile
+import subprocess
+
+import PIL
+from PIL import Image as PILImage
+
+from common import make_alpha, make_graphic, make_photo, peak_rss_mb
+from version import __version__
+import resizer_core
+
+# (종류, 확장자, 생성 함수)
+KINDS = [
+    ("photo", "jpg", make_photo),
+    ("graphic", "png", make_graphic),
+    ("alpha", "png", make_alpha),
+]
+
+FORMATS = ["JPEG", "PNG", "WebP", "AVIF", "TIFF", "BMP"]
+MODES = {"quality": 1, "size": 0}
+
+# 용량 우선 모드에서 목표 용량에 맞춰 화질을 찾는 형식 (목표 대비 출력 용량을 기록)
+SIZE_TARGET_FORMATS = ["JPEG", "WebP", "AVIF"]
+
+# 합성 이미지 폴더의 생성 기록: 이름 → 생성한 픽셀의 MD5와 저장된 파일의 MD5
+# (생성 방식(common.py)을 바꾸면 CORPUS_VERSION을 올려 이전 폴더의 이미지를 다시 만듦)
+CORPUS_MANIFEST = "corpus.json"
+CORPUS_VERSION = 2
+
+
+def file_md5(path):
+    with open(path, "rb") as f:
+        return hashlib.md5(f.read()).hexdigest()
+
+
+def load_corpus_manifest(folder):
+    try:
+        with open(os.path.join(folder, CORPUS_MANIFEST), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return manifest.get("images", {}) if manifest.get("version") == CORPUS_VERSION else {}
+
+
+def make_corpus(folder, megapixels_list, count):
+    """합성 이미지 모음을 만들고 {파일 이름: 생성한 픽셀의 MD5}를 반환합니다.
+
+    폴더에 이미 있는 파일은 같은 생성 방식(CORPUS_VERSION)으로 만들었고 내용이 기록과 같을 때만 다시 사용합니다.
+    픽셀 MD5는 인코더(libjpeg 등) 버전과 관계없으므로, 다른 컴퓨터의 결과와 같은 입력인지 비교하는 데 씁니다.
+    """
+    os.makedirs(folder, exist_ok=True)
+    manifest = load_corpus_manifest(folder)
+    images = {}
+    for megapixels in megapixels_list:
+        w = int((megapixels * 1e6 * 3 / 2) ** 0.5)
+        h = w * 2 // 3
+        for kind, ext, make in KINDS:
+            for i in range(count):
+                name = f"{kind}-{megapixels:g}mp-{i}.{ext}"
+                path = os.path.join(folder, name)
+                entry = manifest.get(name)
+                if entry is None or not os.path.exists(path) or file_md5(path) != entry["file"]:
+                    img = make(w, h, seed=i)
+                    if ext == "jpg":
+                        img.save(path, quality=92)
+                    else:
+                        img.save(path, compress_level=1)
+                    entry = {"pixels": hashlib.md5(img.tobytes()).hexdigest(), "file": file_md5(path)}
+                images[name] = entry
+
+    manifest.update(images)
+    with open(os.path.join(folder, CORPUS_MANIFEST), "w", encoding="utf-8") as f:
+        json.dump({"version": CORPUS_VERSION, "images": manifest}, f, indent=1)
+    return {name: entry["pixels"] for name, entry in images.items()}
+
+
+def size_accuracy(output_folder, max_kb):
+    """출력 파일 용량 / 목표 용량의 평균, 최소, 최대와 목표를 넘은 파일 수"""
+    ratios = [os.path.getsize(os.path.join(output_folder, name)) / (max_kb * 1024)
+              for name in os.listdir(output_folder) if not name.startswith(".")]
+    if not ratios:
+        return None
+    return {
+        "target_kb": max_kb,
+        "mean_ratio": sum(ratios) / len(ratios),
+        "min_ratio": min(ratios),
+        "max_ratio": max(ratios),
+        "over_target": sum(1 for ratio in ratios if ratio > 1),
+    }
+
+
+def run_case(corpus, output_format, mode, args):
+    """한 프로세스 안에서 합성 이미지 모음 전체를 처리하고 결과를 JSON으로 출력합니다."""
+    with tempfile.TemporaryDirectory() as output_folder:
+        baseline = peak_rss_mb()
+        stats = {}
+        resizer_core.process_images([corpus], output_folder, args.width, args.quality, args.max_kb, output_format, mode,
+                                    jobs=1, log=lambda message: None, effort=args.effort, stats=stats)
+        peak = peak_rss_mb()
+        report = stats["report"]
+        print(json.dumps({
+            "format": output_format,
+            "mode": mode,
+            "images": report["images"],
+            "images_per_second": report["images_per_second"],
+            "megapixels_per_second": report["megapixels_per_second"],
+            "encodes_per_image": report["encodes_per_image"],
+            "small_encodes_per_image": report["small_encodes_per_image"],
+            "bytes_out": report["bytes_out"],
+            "peak_rss_mb": peak,
+            "rss_increase_mb": peak - baseline if peak is not None and baseline is not None else None,
+            "size_accuracy": size_accuracy(output_folder, args.max_kb)
+            if mode == MODES["size"] and output_format in SIZE_TARGET_FORMATS else None,
+            "stages": report["stages"],
+        }))
+
+
+def mode_name(mode):
+    return next(name for name, value in MODES.items() if value == mode)
+
+
+def describe(result):
+    text = (f"{result['images_per_second']:.2f}장/초, {result['megapixels_per_second']:.1f}MP/초, "
+            f"장당 인코딩 {result['encodes_per_image']:.1f}회")
+    if result.get("small_encodes_per_image"):
+        text += f" (+ 축소본 {result['small_encodes_per_image']:.1f}회)"
+    if result["peak_rss_mb"] is not None:
+        text += f", 최대 RSS {result['peak_rss_mb']:.0f}MB"
+    if result["size_accuracy"]:
+        accuracy = result["size_accuracy"]
+        text += (f", 목표 대비 {accuracy['mean_ratio']:.2f} ({accuracy['min_ratio']:.2f}~{accuracy['max_ratio']:.2f}, "
+                 f"초과 {accuracy['over_target']}개)")
+    return text
+
+
+def change(old, new, unit=""):
+    if old is None or new is None:
+        return "N/A"
+    percent = f" ({(new - old) / old * 100:+.0f}%)" if old else ""
+    return f"{old:.2f}{unit} → {new:.2f}{unit}{percent}"
+
+
+def compare(base, results):
+    """이전 결과 파일(base)과 경우별로 비교한 내용을 출력합니다."""
+    print(f"\n비교: {base['version']} ({base['created']}) → {results['version']} ({results['created']})")
+    if base["corpus"] != results["corpus"] or base["settings"] != results["settings"]:
+        print("⚠️ 합성 이미지 모음 또는 설정이 달라 직접 비교하기 어렵습니다.")
+    previous = {(result["format"], result["mode"]): result for result in base["results"]}
+    for result in results["results"]:
+        old = previous.get((result["format"], result["mode"]))
+        if old is None:
+            continue
+        lines = [
+            f"  장/초: {change(old['images_per_second'], result['images_per_second'])}",
+            f"  장당 인코딩: {change(old['encodes_per_image'], result['encodes_per_image'])}",
+            f"  장당 축소본 인코딩: {change(old.get('small_encodes_per_image'), result['small_encodes_per_image'])}",
+            f"  최대 RSS: {change(old['peak_rss_mb'], result['peak_rss_mb'], 'MB')}",
+        ]
+        if old["size_accuracy"] and result["size_accuracy"]:
+            lines.append(f"  목표 대비 용량: {change(old['size_accuracy']['mean_ratio'], result['size_accuracy']['mean_ratio'])}")
+        print(f"{result['format']} / {mode_name(result['mode'])}\n" + "\n".join(lines))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="합성 이미지 모음 일괄 처리 벤치마크")
+    parser.add_argument("--megapixels", default="2,12,24", help="합성 이미지 크기(MP) 목록 (쉼표로 구분)")
+    parser.add_argument("--count", type=int, default=2, help="크기/종류별 이미지 수")
+    parser.add_argument("--formats", default=",".join(FORMATS).lower(), help="출력 형식 목록 (쉼표로 구분)")
+    parser.add_argument("--width", type=int, default=1024, help="출력 최대 너비(px)")
+    parser.add_argument("--quality", type=int, default=85, help="화질 우선 모드의 화질")
+    parser.add_argument("--max-kb", type=int, default=300, help="용량 우선 모드의 최대 용량(KB)")
+    parser.add_argument("--effort", choices=resizer_core.EFFORT_CHOICES, default=resizer_core.DEFAULT_EFFORT)
+    parser.add_argument("--corpus", default=os.path.join(tempfile.gettempdir(), "k-imageresizer-bench"),
+                        help="합성 이미지 폴더 (있으면 다시 사용)")
+    parser.add_argument("--output", default=f"bench-{__version__}.json", help="결과 파일(JSON)")
+    parser.add_argument("--compare", help="비교할 이전 결과 파일(JSON)")
+    parser.add_argument("--case", help=argparse.SUPPRESS)
+    parser.add_argument("--mode", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        run_case(args.corpus, args.case, args.mode, args)
+        return
+
+    megapixels_list = [float(value) for value in args.megapixels.split(",")]
+    checksums = make_corpus(args.corpus, megapixels_list, args.count)
+    print(f"합성 이미지 {len(checksums)}장 ({args.megapixels} MP, 사진/그래픽/투명 PNG): {args.corpus}")
+
+    PILImage.init()
+    formats = {name.lower(): name for name in FORMATS}
+    results = []
+    for output_format in (formats[name.strip().lower()] for name in args.formats.split(",")):
+        if output_format.upper() not in PILImage.SAVE:
+            print(f"{output_format}: 이 Pillow에서 저장할 수 없어 건너뜀")
+            continue
+        for mode in MODES.values():
+            command = [sys.executable, __file__, "--case", output_format, "--mode", str(mode), "--corpus", args.corpus,
+                       "--width", str(args.width), "--quality", str(args.quality), "--max-kb", str(args.max_kb),
+                       "--effort", args.effort]
+            output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            results.append(result)
+            print(f"{output_format} / {mode_name(mode)}: {describe(result)}")
+
+    results = {
+        "version": __version__,
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "pillow": PIL.__version__,
+        "platform": platform.platform(),
+        "settings": {"megapixels": megapixels_list, "count": args.count, "width": args.width, "quality": args.quality,
+                     "max_kb": args.max_kb, "effort": args.effort},
+        "corpus": checksums,
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=1)
+    print(f"결과 저장: {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(json.load(f), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# 이미지 뷰어 본문 표시: 첫 화면까지 걸리는 시간(빠른 미리보기)과 고화질(LANCZOS) 처리 시간 비교
+#
+# 사용법: python benchmarks/bench_view_preview.py [--megapixels 40] [--box 1280x800] [--count 3]
+import os
+import time
+import argparse
+import tempfile
+
+from common import make_photo
+from thumbnail_cache import render_view_image
+
+
+def time_render(files, box, fast):
+    """파일들을 표시용으로 만드는 데 걸린 이미지당 평균 시간(ms)"""
+    start = time.perf_counter()
+    for path in files:
+        render_view_image(path, box, fast)
+    return (time.perf_counter() - start) / len(files) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="뷰어 미리보기 벤치마크")
+    parser.add_argument("--megapixels", type=float, default=40)
+    parser.add_argument("--box", default="1280x800", help="표시 영역 크기 (너비x높이)")
+    parser.add_argument("--count", type=int, default=3, help="테스트 이미지 수")
+    args = parser.parse_args()
+    box = tuple(int(v) for v in args.box.lower().split("x"))
+
+    with tempfile.TemporaryDirectory() as folder:
+        w = int((args.megapixels * 1e6 * 3 / 2) ** 0.5)
+        h = w * 2 // 3
+        files = []
+        for i in range(args.count):
+            path = os.path.join(folder, f"{i}.jpg")
+            make_photo(w, h, seed=i).save(path, quality=92)
+            files.append(path)
+        print(f"입력: {args.count}장, {w}x{h} ({w * h / 1e6:.1f} MP) JPEG -> 표시 영역 {box[0]}x{box[1]}")
+
+        time_render(files[:1], box, True)  # 첫 실행 준비(라이브러리 로드 등) 제외
+        fast = time_render(files, box, True)
+        full = time_render(files, box, False)
+        print(f"첫 화면 (빠른 미리보기: draft + reduce + BILINEAR): {fast:.0f} ms/장")
+        print(f"고화질 (원본 해상도 LANCZOS): {full:.0f} ms/장")
+        print(f"첫 화면까지 {full / fast:.1f}배 빠름")
+
+
+if __name__ == "__main__":
+    main()
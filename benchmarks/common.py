@@ -0,0 +1,95 @@
+# 벤치마크 공용 도구: 재현 가능한 합성 이미지 생성, 최대 메모리(RSS) 측정
+import os
+import sys
+import random
+
+from PIL import Image as PILImage, ImageDraw, ImageFilter
+
+# 저장소 루트의 resizer_core를 불러올 수 있도록 경로 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+def peak_rss_mb():
+    """현재 프로세스의 최대 메모리 사용량(MB)을 반환합니다. (측정할 수 없으면 None)"""
+    # Linux: VmHWM은 exec 시 초기화되므로 부모 프로세스의 사용량이 섞이지 않음 (ru_maxrss는 섞임)
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if psutil is not None and hasattr(psutil.Process().memory_info(), "peak_wset"):  # Windows
+        return psutil.Process().memory_info().peak_wset / (1024 * 1024)
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    return None
+
+
+def make_noise(size, sigma, rng):
+    """rng로 만든 회색 노이즈 (평균 128, 표준편차 약 sigma)
+
+    PIL의 effect_noise는 C rand()를 사용해 seed와 관계없이 호출 순서/플랫폼마다 결과가 달라지므로 사용하지 않습니다.
+    """
+    noise = PILImage.frombytes("L", size, rng.randbytes(size[0] * size[1]))
+    scale = sigma / 73.9  # 0~255 균등 분포의 표준편차
+    return noise.point(lambda v: max(0, min(255, round(128 + (v - 128) * scale))))
+
+
+def make_photo(width, height, seed):
+    """사진과 비슷한 합성 이미지(그라데이션 + 저주파/고주파 노이즈 + 도형)를 seed로 재현 가능하게 만듭니다."""
+    rng = random.Random(seed)
+    base = PILImage.linear_gradient("L").resize((width, height)).convert("RGB")
+    blotches = make_noise((max(1, width // 8), max(1, height // 8)), 80, rng).resize((width, height), PILImage.BICUBIC)
+    grain = make_noise((width, height), rng.randint(5, 40), rng)
+    img = PILImage.blend(PILImage.blend(base, blotches.convert("RGB"), 0.5), grain.convert("RGB"), 0.3)
+
+    draw = ImageDraw.Draw(img)
+    for _ in range(40):
+        x, y = rng.randrange(width), rng.randrange(height)
+        r = rng.randrange(10, max(11, width // 6))
+        draw.ellipse((x, y, x + r, y + r), fill=tuple(rng.randrange(256) for _ in range(3)))
+    return img.filter(ImageFilter.GaussianBlur(rng.choice([0, 0.5, 1, 2])))
+
+
+def make_graphic(width, height, seed):
+    """도표/화면 캡처와 비슷한 합성 이미지(단색 면 + 선 + 글자 모양 막대)를 seed로 재현 가능하게 만듭니다."""
+    rng = random.Random(seed)
+    palette = [tuple(rng.randrange(256) for _ in range(3)) for _ in range(8)]
+    img = PILImage.new("RGB", (width, height), palette[0])
+    draw = ImageDraw.Draw(img)
+    for _ in range(30):
+        x, y = rng.randrange(width), rng.randrange(height)
+        draw.rectangle((x, y, x + rng.randrange(20, max(21, width // 3)), y + rng.randrange(20, max(21, height // 3))),
+                       fill=rng.choice(palette))
+    for _ in range(60):
+        draw.line((rng.randrange(width), rng.randrange(height), rng.randrange(width), rng.randrange(height)),
+                  fill=rng.choice(palette), width=rng.randrange(1, 6))
+    line_height = max(8, height // 60)
+    for y in range(line_height, height - line_height, line_height * 2):
+        x = line_height
+        while x < width // 2:
+            word = rng.randrange(line_height, line_height * 6)
+            draw.rectangle((x, y, x + word, y + line_height // 2), fill=(20, 20, 20))
+            x += word + line_height
+    return img
+
+
+def make_alpha(width, height, seed):
+    """투명 영역이 있는 RGBA 합성 이미지(사진 + 가장자리가 부드러운 타원 마스크)를 seed로 재현 가능하게 만듭니다."""
+    img = make_photo(width, height, seed).convert("RGBA")
+    mask = PILImage.new("L", (width, height), 0)
+    ImageDraw.Draw(mask).ellipse((width // 10, height // 10, width * 9 // 10, height * 9 // 10), fill=255)
+    img.putalpha(mask.filter(ImageFilter.GaussianBlur(max(1, width // 100))))
+    return img
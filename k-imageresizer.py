@@ -1,17 +1,22 @@
 import os
 from subprocess import Popen
 import threading
+import multiprocessing
 import wx
 import wx.adv
 import json
-from PIL import Image as PILImage, ImageOps, ImageFile
-ImageFile.LOAD_TRUNCATED_IMAGES = True
-import shutil
 import wx.richtext as rt
 import time
 import re
+import math
 import psutil
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from wx.lib.agw.floatspin import FloatSpin
+from resizer_core import (BATCH_REPORT_FILE, DEFAULT_CACHE_MB, DEFAULT_COPY_STRATEGY, DEFAULT_EFFORT, FAILURE_REPORT_FILE, FailureReport, clear_folder, default_cache_dir, is_copy_through, is_image_file,
+                          normalize_path, output_format_for, physical_core_count, probe_image, process_images,
+                          scan_image_files)
+from thumbnail_cache import DEFAULT_THUMB_CACHE_MB, ThumbnailCache, decode_thumbnail, render_view_image
 
 
 # 설정을 저장할 JSON 파일 경로
@@ -25,30 +30,40 @@ DEFAULT_SETTINGS = {
     "output_format": "JPEG",
     "clear_folder": True,
     "mode": 1,
+    "jobs": physical_core_count(),  # 기본값: 물리 코어 수
+    "effort": DEFAULT_EFFORT,
+    "copy_strategy": DEFAULT_COPY_STRATEGY,
+    "incremental": False,
+    "recursive": False,
+    "encode_cache": False,
+    "encode_cache_dir": default_cache_dir(),
+    "encode_cache_mb": DEFAULT_CACHE_MB,
+    "memory_budget_mb": None,  # 병렬 처리 메모리 한도(MB), None이면 사용 가능한 메모리의 절반, 0이면 제한 없음
+    "thumbnail_cache_mb": DEFAULT_THUMB_CACHE_MB,
 }
 
+# 인코딩 노력 단계 (WebP/AVIF) 표시 이름
+EFFORT_LABELS = {"fast": "빠름", "balanced": "균형", "best": "최고"}
 
-def clear_folder(folder_path):
-    """지정한 폴더 내의 파일을 모두 삭제합니다."""
-    if not os.path.isdir(folder_path):
-        print("폴더가 존재하지 않습니다.")
-        return
+# 원본 그대로 저장하는 이미지의 저장 방식 표시 이름
+COPY_STRATEGY_LABELS = {"copy": "복사", "reflink": "복제(reflink)", "hardlink": "하드 링크"}
 
-    for filename in os.listdir(folder_path):
-        file_path = os.path.join(folder_path, filename)
-        if os.path.isfile(file_path):
-            try:
-                os.remove(file_path)
-            except Exception as e:
-                e_ = f"{e}".replace("\\\\", "\\")
-                print(f"❌ 파일 삭제 실패: {file_path} - {e_}")
-                wx.MessageBox(f"❌ 파일 삭제 실패: {os.path.basename(file_path)}", "오류", wx.ICON_ERROR)
+# 이미지 뷰어 썸네일: 화면 밖으로 미리 읽어 둘 썸네일 수(양쪽), 메모리에 보관할 최대 썸네일 수
+THUMB_PREFETCH = 8
+THUMB_CACHE_SIZE = 300
+THUMB_WORKERS = min(4, os.cpu_count() or 1)  # 썸네일 디코딩 스레드 수
+
+# 이미지 뷰어 본문: 표시용으로 줄인 이미지를 보관할 최대 용량(MB), 앞뒤로 미리 읽어 둘 이미지 수
+VIEW_CACHE_MB = 256
+VIEW_PREFETCH = 2
+VIEW_REFINE_DELAY_MS = 250  # 빠른 미리보기를 띄운 뒤 이 시간 동안 머무르면 고화질(LANCZOS)로 교체
+
+# 이미지 뷰어에서 읽지 못한 썸네일/이미지 목록을 저장할 경로 (.json/.csv)
+VIEWER_FAILURE_REPORT = os.path.join(os.path.expanduser("~"), ".k-imageresizer", "viewer-failures")
+
+# 이미지 처리 중 로그/진행 상황을 화면에 반영하는 간격(ms) (처리 속도와 관계없이 초당 약 10회)
+STATUS_FLUSH_MS = 100
 
-def normalize_extension(output_path, format_name):
-    if format_name.lower() in ["jpeg", "jpg"]:
-        base, _ = os.path.splitext(output_path)
-        return base + ".jpg"
-    return output_path
 
 def show_image_viewer_with_splash(parent, images):
     viewer = ImageViewerFrame(parent, "이미지 뷰어", images)
@@ -80,6 +95,291 @@ class Toast(wx.Frame):
         wx.CallLater(duration, self.Close)
 
 
+class ThumbnailLoader:
+    """썸네일을 작업 스레드에서 디코딩하고, 끝나면 wx.CallAfter로 UI 스레드의 on_ready(경로, 크기, 데이터, 예외)를 호출합니다.
+
+    cache(ThumbnailCache)가 주어지면 디스크 캐시에서 먼저 찾고, 새로 만든 썸네일은 캐시에 저장합니다.
+    retain()으로 더 이상 필요 없는 대기 작업을 취소하고, cancel()은 실행 중인 작업의 결과까지 버립니다.
+    """
+    def __init__(self, size, on_ready, cache=None, workers=THUMB_WORKERS):
+        self.size = size
+        self.on_ready = on_ready
+        self.cache = cache
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.futures = {}  # 경로 → Future (요청했지만 아직 전달되지 않은 작업)
+        self.generation = 0
+
+    def request(self, path):
+        if path in self.futures:
+            return
+        generation = self.generation
+        future = self.executor.submit(self.cache.load if self.cache else decode_thumbnail, path, self.size)
+        self.futures[path] = future
+        future.add_done_callback(lambda f: wx.CallAfter(self.deliver, path, f, generation))
+
+    def deliver(self, path, future, generation):
+        if generation != self.generation or future.cancelled():
+            return
+        self.futures.pop(path, None)
+        try:
+            size, data = future.result()
+        except Exception as e:
+            self.on_ready(path, None, None, e)
+        else:
+            self.on_ready(path, size, data, None)
+
+    def retain(self, paths):
+        """paths에 없는 대기 작업을 취소합니다. (스크롤로 화면에서 벗어난 썸네일)"""
+        for path in list(self.futures):
+            if path not in paths and self.futures[path].cancel():
+                del self.futures[path]
+
+    def cancel(self):
+        self.generation += 1
+        for future in self.futures.values():
+            future.cancel()
+        self.futures.clear()
+
+    def shutdown(self):
+        self.cancel()
+        self.executor.shutdown(wait=True, cancel_futures=True)  # 실행 중인 작업(최대 작업자 수)만 마무리
+        if self.cache:
+            self.cache.close()
+
+
+class ViewImageCache:
+    """뷰어 본문 이미지 캐시
+
+    (경로, 표시 영역 크기, 빠른 미리보기 여부)별로 표시 크기로 줄인 RGB 이미지를 최근 사용 순으로 max_mb까지 보관하고,
+    prefetch()로 고화질 이미지를 작업 스레드에서 미리 만들어 둡니다. 창 크기가 바뀌면 clear()로 비웁니다.
+    """
+    def __init__(self, max_mb=VIEW_CACHE_MB, workers=2):
+        self.max_bytes = max_mb * 1024 * 1024
+        self.items = OrderedDict()  # (경로, 표시 영역 크기, 빠른 미리보기 여부) → render_view_image 결과
+        self.total = 0
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.futures = {}  # 미리 만드는 중인 키 → Future
+        self.generation = 0
+
+    def peek(self, path, box):
+        """캐시에 있는 고화질 이미지를 반환합니다. (없으면 None)"""
+        key = (path, box, False)
+        with self.lock:
+            item = self.items.get(key)
+            if item is not None:
+                self.items.move_to_end(key)
+            return item
+
+    def get_preview(self, path, box):
+        """빠른 미리보기 이미지를 반환합니다. 캐시에 없으면 직접 만듭니다. (고화질은 prefetch/when_ready로 만듦)"""
+        key = (path, box, True)
+        with self.lock:
+            item = self.items.get(key)
+            if item is not None:
+                self.items.move_to_end(key)
+                return item
+
+        item = render_view_image(path, box, True)
+        self.add(key, item, self.generation)
+        return item
+
+    def prefetch(self, paths, box):
+        """paths의 고화질 이미지를 순서대로 미리 만들어 둡니다. 목록에 없는 대기 작업은 취소합니다."""
+        keys = [(path, box, False) for path in paths]
+        with self.lock:
+            for key in list(self.futures):
+                if key not in keys and self.futures[key].cancel():
+                    del self.futures[key]
+            for key in keys:
+                if key not in self.items and key not in self.futures:
+                    self.futures[key] = self.executor.submit(self.render, key, self.generation)
+
+    def when_ready(self, path, box, callback):
+        """고화질 이미지가 준비되면 UI 스레드에서 callback(결과)를 호출합니다. (prefetch로 요청한 뒤 사용)"""
+        key = (path, box, False)
+        with self.lock:
+            item = self.items.get(key)
+            future = self.futures.get(key)
+        if item is not None:
+            wx.CallAfter(callback, item)
+        elif future is not None:
+            future.add_done_callback(
+                lambda f: f.cancelled() or f.exception() is not None or wx.CallAfter(callback, f.result()))
+
+    def render(self, key, generation):
+        try:
+            item = render_view_image(*key)
+            self.add(key, item, generation)
+            return item
+        finally:
+            with self.lock:
+                self.futures.pop(key, None)
+
+    def add(self, key, item, generation):
+        with self.lock:
+            if generation != self.generation or key in self.items:
+                return
+            self.items[key] = item
+            self.total += len(item[1])
+            while self.total > self.max_bytes and len(self.items) > 1:
+                _, old = self.items.popitem(last=False)
+                self.total -= len(old[1])
+
+    def clear(self):
+        with self.lock:
+            self.generation += 1
+            for future in self.futures.values():
+                future.cancel()
+            self.futures.clear()
+            self.items.clear()
+            self.total = 0
+
+    def shutdown(self):
+        self.clear()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class ThumbnailStrip(wx.ScrolledWindow):
+    """이미지 뷰어 하단의 썸네일 줄 (가상 스크롤)
+
+    썸네일마다 위젯을 만들지 않고, 화면에 보이는 범위(+앞뒤 THUMB_PREFETCH개)만 직접 그립니다.
+    디코딩은 ThumbnailLoader가 작업 스레드에서 하며, 도착하는 대로 다시 그립니다.
+    디코딩한 썸네일은 최근 사용 순으로 THUMB_CACHE_SIZE개까지만 보관합니다.
+    만들지 못한 썸네일은 빈 칸으로 두고, failures(FailureReport)가 주어지면 기록합니다.
+    """
+    def __init__(self, parent, images, thumbnail_size, on_click, cache_mb=DEFAULT_THUMB_CACHE_MB, failures=None):
+        super().__init__(parent, style=wx.HSCROLL)
+        self.images = images
+        self.thumbnail_size = thumbnail_size
+        self.on_click = on_click
+        self.failures = failures
+        self.selected = -1
+        self.bitmaps = OrderedDict()  # 경로 → wx.Bitmap (생성 실패 시 None)
+        self.load_pending = False
+        try:
+            cache = ThumbnailCache(max_mb=cache_mb)
+        except Exception as e:  # 캐시 파일을 열 수 없으면 캐시 없이 진행
+            print(f"썸네일 캐시 사용 불가: {e}")
+            cache = None
+        self.loader = ThumbnailLoader(thumbnail_size, self.on_thumbnail_ready, cache)
+
+        self.cell_size = (thumbnail_size[0] + 8, thumbnail_size[1] + 8)  # 선택 강조 테두리 포함
+        self.slot_width = self.cell_size[0] + 4  # 썸네일 간격 포함
+        self.SetMinSize((-1, self.cell_size[1] + 4 + wx.SystemSettings.GetMetric(wx.SYS_HSCROLL_Y)))
+        self.SetBackgroundStyle(wx.BG_STYLE_PAINT)
+        self.SetScrollRate(10, 0)
+
+        self.Bind(wx.EVT_PAINT, self.on_paint)
+        self.Bind(wx.EVT_LEFT_DOWN, self.on_left_down)
+        self.refresh_items()
+
+    def refresh_items(self):
+        """이미지 목록이 바뀐 뒤 호출 (스크롤 범위 갱신, 다시 그리면서 필요 없어진 요청은 취소됨)"""
+        self.SetVirtualSize((len(self.images) * self.slot_width, -1))
+        self.Refresh()
+
+    def visible_range(self, margin=0):
+        view_left = self.CalcUnscrolledPosition(0, 0)[0]
+        first = view_left // self.slot_width
+        last = (view_left + self.GetClientSize().width) // self.slot_width + 1
+        return max(0, first - margin), min(len(self.images), last + margin)
+
+    def on_paint(self, event):
+        dc = wx.AutoBufferedPaintDC(self)
+        self.DoPrepareDC(dc)
+        dc.SetBackground(wx.Brush(self.GetBackgroundColour()))
+        dc.Clear()
+
+        missing = False
+        cell_width, cell_height = self.cell_size
+        first, last = self.visible_range()
+        for idx in range(first, last):
+            x = idx * self.slot_width + 2
+            if idx == self.selected:
+                dc.SetPen(wx.TRANSPARENT_PEN)
+                dc.SetBrush(wx.Brush(wx.Colour(30, 144, 255)))  # DodgerBlue
+                dc.DrawRectangle(x, 2, cell_width, cell_height)
+
+            path = self.images[idx]
+            if path not in self.bitmaps:
+                missing = True
+                continue
+            bmp = self.bitmaps[path]
+            if bmp is not None:
+                dc.DrawBitmap(bmp, x + (cell_width - bmp.GetWidth()) // 2, 2 + (cell_height - bmp.GetHeight()) // 2)
+
+        if missing and not self.load_pending:
+            self.load_pending = True
+            wx.CallAfter(self.load_visible)
+
+    def load_visible(self):
+        """보이는 범위와 앞뒤 여유분 중 아직 없는 썸네일을 요청합니다. (보이는 범위 먼저)"""
+        self.load_pending = False
+        if not self:  # 창이 이미 닫힘
+            return
+
+        first, last = self.visible_range()
+        prefetch_first, prefetch_last = self.visible_range(THUMB_PREFETCH)
+        order = list(range(first, last)) + list(range(last, prefetch_last)) + list(range(first - 1, prefetch_first - 1, -1))
+        wanted = [self.images[idx] for idx in order if self.images[idx] not in self.bitmaps]
+        self.loader.retain(set(wanted))
+        for path in wanted:
+            self.loader.request(path)
+        for idx in range(first, last):
+            if self.images[idx] in self.bitmaps:
+                self.bitmaps.move_to_end(self.images[idx])
+
+    def on_thumbnail_ready(self, path, size, data, error):
+        if not self:  # 창이 이미 닫힘
+            return
+
+        if error is not None:
+            e_ = f"{error}".replace("\\\\", "\\")
+            print(f"❌ 썸네일 생성 실패: {path} - {e_}")
+            if self.failures is not None:
+                self.failures.add(path, "thumbnail", error)
+            self.bitmaps[path] = None
+        else:
+            wx_img = wx.Image(size[0], size[1])
+            wx_img.SetData(data)
+            self.bitmaps[path] = wx.Bitmap(wx_img)
+
+        first, last = self.visible_range(THUMB_PREFETCH)
+        while len(self.bitmaps) > max(THUMB_CACHE_SIZE, last - first):
+            self.bitmaps.popitem(last=False)
+        self.Refresh()
+
+    def on_left_down(self, event):
+        x = self.CalcUnscrolledPosition(event.GetPosition())[0]
+        idx = x // self.slot_width
+        if 0 <= idx < len(self.images):
+            self.on_click(idx)
+        event.Skip()
+
+    def select(self, idx):
+        self.selected = idx
+        if 0 <= idx < len(self.images) and not self.is_fully_visible(idx):
+            self.scroll_to_center(idx)
+        self.Refresh()
+
+    def is_fully_visible(self, idx):
+        view_left = self.CalcUnscrolledPosition(0, 0)[0]
+        view_right = view_left + self.GetClientSize().width
+        thumb_left = idx * self.slot_width
+        return thumb_left >= view_left and thumb_left + self.slot_width <= view_right
+
+    def scroll_to_center(self, idx):
+        scroll_rate_x, _ = self.GetScrollPixelsPerUnit()
+        thumb_center = idx * self.slot_width + self.slot_width // 2
+        target_px = max(0, thumb_center - self.GetClientSize().width // 2)
+        self.Scroll(target_px // max(1, scroll_rate_x), 0)
+
+    def clear(self):
+        self.loader.shutdown()
+        self.bitmaps.clear()
+
+
 class ImageViewerFrame(wx.Frame):
     def __init__(self, parent, title, images, start_index=0, on_delete_callback=None, on_restore_callback=None, splash=None):
         super().__init__(parent, title=title, size=(948, 600))
@@ -93,6 +393,11 @@ class ImageViewerFrame(wx.Frame):
         self.current_image_idx = start_index
         self.thumbnail_size = (80, 80)
         self.delete_stack = []  # 🔁 최근 삭제 항목들을 쌓아둘 스택
+        self.failures = FailureReport()  # 읽지 못한 썸네일/이미지 (창을 닫을 때 한 번에 알림)
+        self.view_cache = ViewImageCache()  # 본문 이미지 캐시 + 앞뒤 이미지 미리 읽기
+        self.last_view_box = None
+        self.resize_timer = None
+        self.refine_timer = None
 
         self.panel = wx.Panel(self)
         self.vbox = wx.BoxSizer(wx.VERTICAL)
@@ -155,11 +460,9 @@ class ImageViewerFrame(wx.Frame):
 
         self.vbox.Add(nav_sizer, 0, wx.ALIGN_CENTER | wx.BOTTOM, 10)
 
-        # 썸네일 내비게이션 바
-        self.thumb_panel = wx.ScrolledWindow(self.panel, style=wx.HSCROLL)
-        self.thumb_panel.SetScrollRate(5, 0)
-        self.thumb_sizer = wx.BoxSizer(wx.HORIZONTAL)
-        self.thumb_panel.SetSizer(self.thumb_sizer)
+        # 썸네일 내비게이션 바 (보이는 범위만 그때그때 로드)
+        self.thumb_panel = ThumbnailStrip(self.panel, self.images, self.thumbnail_size, self.on_thumbnail_click,
+                                          parent.settings["thumbnail_cache_mb"], self.failures)
         self.vbox.Add(self.thumb_panel, 0, wx.EXPAND | wx.ALL, 5)
 
         self.panel.SetSizer(self.vbox)
@@ -167,10 +470,6 @@ class ImageViewerFrame(wx.Frame):
         self.Center()
         self.Show()
 
-        self.thumbnails = []
-        self.load_thumbnails()
-        self.update_scroll_rate()
-
         # 더블 클릭 시 이미지뷰어를 닫는 이벤트 바인딩
         self.image_bitmap.Bind(wx.EVT_LEFT_DCLICK, self.on_double_click)
 
@@ -194,6 +493,7 @@ class ImageViewerFrame(wx.Frame):
         self.Bind(wx.EVT_MENU, lambda e: self.open_help_center(e), id=wx.ID_HELP)
 
         self.Bind(wx.EVT_CLOSE, self.OnClose)
+        self.Bind(wx.EVT_SIZE, self.on_size)
 
         self.load_image()
         if splash:
@@ -205,7 +505,7 @@ class ImageViewerFrame(wx.Frame):
         dlg.ShowModal()
 
     def on_delete_image(self, event):
-        if len(self.thumbnails) == 1:
+        if len(self.images) == 1:
             wx.MessageBox("하나밖에 없는 썸네일! 삭제하지 말아 주세요.", "알림", wx.ICON_INFORMATION)
             return
 
@@ -220,18 +520,9 @@ class ImageViewerFrame(wx.Frame):
         # 삭제 직전 정보 저장
         self.delete_stack.append((path, self.current_image_idx))
 
-        # 🔥 썸네일 삭제
-        thumb_to_remove = self.thumbnails.pop(self.current_image_idx)
-        thumb_to_remove.Destroy()  # UI에서 삭제
-        del thumb_to_remove  # 참조도 제거
-
-        # 🔥 이미지 목록에서도 삭제
+        # 🔥 이미지 목록에서 삭제 (썸네일 줄도 같은 목록을 사용)
         del self.images[self.current_image_idx]
-
-        # 🔥 썸네일 레이아웃 갱신
-        self.thumb_panel.Layout()
-        self.thumb_panel.FitInside()
-        self.update_scroll_rate()
+        self.thumb_panel.refresh_items()
 
         # 🔥 호출자에게 알려서 리스트컨트롤에서 해당 항목 삭제하게 함
         if self.on_delete_callback:
@@ -245,8 +536,6 @@ class ImageViewerFrame(wx.Frame):
                 self.current_image_idx -= 1
             self.load_image()
 
-        # 썸네일 삭제 후 인덱스 바인딩 갱신
-        self.rebind_thumbnail_events()
         Toast(self, f"리스트에서 삭제됨: {os.path.basename(path)}", 1000)
 
     def on_undo_delete(self, event):
@@ -257,35 +546,8 @@ class ImageViewerFrame(wx.Frame):
         path, index = self.delete_stack.pop()
         self.images.insert(index, path)
 
-        # 썸네일 복원
-        try:
-            img = PILImage.open(path)
-            img = ImageOps.exif_transpose(img)
-            img.thumbnail(self.thumbnail_size)
-
-            wx_img = wx.Image(img.size[0], img.size[1])
-            wx_img.SetData(img.convert("RGB").tobytes())
-            bmp = wx.Bitmap(wx_img)
-
-            thumb_panel = wx.Panel(self.thumb_panel, size=(self.thumbnail_size[0] + 8, self.thumbnail_size[1] + 8))
-            thumb_panel.SetBackgroundColour(wx.NullColour)
-
-            thumb_bitmap = wx.StaticBitmap(thumb_panel, bitmap=bmp)
-            thumb_bitmap.Center()
-            thumb_bitmap.Bind(wx.EVT_LEFT_DOWN, lambda evt, i=index: self.on_thumbnail_click(i))
-
-            self.thumbnails.insert(index, thumb_panel)
-            self.thumb_sizer.Insert(index + 1, thumb_panel, 0, wx.ALL, 2)  # +1 to skip left spacer
-
-        except Exception as e:
-            e_ = f"{e}".replace("\\\\", "\\")
-            print(f"❌ 썸네일 복원 실패: {path} - {e_}")
-            wx.MessageBox(f"❌ 썸네일 복원 실패: {os.path.basename(path)}", "오류", wx.ICON_ERROR)
-
-        self.rebind_thumbnail_events()
-        self.thumb_panel.Layout()
-        self.thumb_panel.FitInside()
-        self.update_scroll_rate()
+        # 썸네일 복원 (다시 보일 때 로드됨)
+        self.thumb_panel.refresh_items()
 
         self.load_image()
 
@@ -295,74 +557,9 @@ class ImageViewerFrame(wx.Frame):
 
         Toast(self, f"리스트에 복원: {os.path.basename(path)}", 1000)
 
-    def rebind_thumbnail_events(self):
-        for idx, thumb_panel in enumerate(self.thumbnails):
-            children = thumb_panel.GetChildren()
-            if not children:
-                continue
-
-            thumb_bitmap = children[0]
-
-            # 기존 핸들러 해제 (바로 이벤트 언바인드)
-            thumb_bitmap.Unbind(wx.EVT_LEFT_DOWN)
-
-            # 새 인덱스로 이벤트 다시 바인딩
-            thumb_bitmap.Bind(wx.EVT_LEFT_DOWN, lambda evt, i=idx: self.on_thumbnail_click(i))
-
-    def update_scroll_rate(self):
-        """썸네일 수, 해상도, 화면 크기에 따라 적절한 스크롤 단위를 설정"""
-        thumb_count = len(self.thumbnails)
-        panel_width = self.thumb_panel.GetClientSize().width
-
-        # 기준 썸네일 크기 + 마진 포함
-        thumb_width = self.thumbnail_size[0] + 8 + 4  # padding 고려
-
-        # 전체 썸네일이 패널보다 작으면 스크롤 안 해도 됨
-        total_thumb_width = thumb_count * thumb_width
-        if total_thumb_width <= panel_width:
-            self.thumb_panel.SetScrollRate(0, 0)
-            return
-
-        # 총 썸네일 너비 대비 스크롤 폭을 적절히 조정
-        scroll_unit = max(1, min(thumb_width // 4, 10))  # 1~10 사이 적절히 조절
-        self.thumb_panel.SetScrollRate(scroll_unit, 0)
-
     def on_double_click(self, event):
         self.Close()  # 더블클릭 시 이미지뷰어를 닫음
 
-    def load_thumbnails(self):
-        for idx, path in enumerate(self.images):
-            try:
-                img = PILImage.open(path)
-                img = ImageOps.exif_transpose(img)
-                img.thumbnail(self.thumbnail_size)
-
-                wx_img = wx.Image(img.size[0], img.size[1])
-                wx_img.SetData(img.convert("RGB").tobytes())
-                bmp = wx.Bitmap(wx_img)
-
-                thumb_panel = wx.Panel(self.thumb_panel, size=(self.thumbnail_size[0]+8, self.thumbnail_size[1]+8))
-                thumb_panel.SetBackgroundColour(wx.NullColour)
-
-                thumb_bitmap = wx.StaticBitmap(thumb_panel, bitmap=bmp)
-                thumb_bitmap.Center()
-                thumb_bitmap.Bind(wx.EVT_LEFT_DOWN, lambda evt, i=idx: self.on_thumbnail_click(i))
-
-                self.thumb_sizer.Add(thumb_panel, 0, wx.ALL, 2)
-                self.thumbnails.append(thumb_panel)
-
-            except Exception as e:
-                e_ = f"{e}".replace("\\\\", "\\")
-                print(f"❌ 썸네일 생성 실패: {path} - {e_}")
-                wx.MessageBox(f"❌ 썸네일 생성 실패: {os.path.basename(path)}", "오류", wx.ICON_ERROR)
-
-
-        self.thumb_sizer.AddStretchSpacer(1)
-        self.thumb_panel.Layout()
-        self.thumb_panel.FitInside()
-        self.thumb_panel.SetVirtualSize(self.thumb_sizer.GetMinSize())
-        self.panel.Layout()
-
     def on_thumbnail_click(self, idx):
         if idx == self.current_image_idx:
             return
@@ -371,65 +568,107 @@ class ImageViewerFrame(wx.Frame):
         self.load_image()
         self.highlight_thumbnail(idx)
 
+    def view_box(self):
+        """본문 이미지를 표시할 영역 크기 (썸네일 줄과 내비게이션 바 제외)"""
+        panel_width, panel_height = self.panel.GetSize()
+        panel_height -= self.thumbnail_size[1] + 50
+        return max(1, panel_width), max(1, panel_height)
+
     def load_image(self):
         path = self.images[self.current_image_idx]
+        box = self.view_box()
+        self.last_view_box = box
+        if self.refine_timer is not None:
+            self.refine_timer.Stop()
+            self.refine_timer = None
 
         try:
-            with PILImage.open(path) as img:
-                img = ImageOps.exif_transpose(img)
-
-                panel_width, panel_height = self.panel.GetSize()
-                panel_height -= self.thumbnail_size[1] + 80
+            # 고화질 이미지가 캐시에 없으면 빠른 미리보기를 먼저 표시하고, 머무르면 고화질로 교체
+            item = self.view_cache.peek(path, box)
+            if item is None:
+                item = self.view_cache.get_preview(path, box)
+                self.refine_timer = wx.CallLater(VIEW_REFINE_DELAY_MS, self.refine_image, path, box)
+            self.show_view_image(item)
+            self.page_label.SetLabel(f"{self.current_image_idx + 1} / {len(self.images)}")
 
-                # ⭐ 원본 해상도
-                original_width, original_height = img.size
+            self.prev_btn.Enable(self.current_image_idx > 0)
+            self.next_btn.Enable(self.current_image_idx < len(self.images) - 1)
 
-                # ⭐ 파일 용량
-                file_size_bytes = os.path.getsize(path)
+            self.highlight_thumbnail(self.current_image_idx)
+            self.panel.Layout()
 
-                # 용량 포맷: 1MB 이상이면 MB, 그 외에는 KB로 표시
-                if file_size_bytes >= 1024 * 1024:
-                    file_size = f"{file_size_bytes / (1024 * 1024):.1f} MB"
-                else:
-                    file_size = f"{file_size_bytes / 1024:.1f} KB"
+        except Exception as e:
+            e_ = f"{e}".replace("\\\\", "\\")
+            print(f"❌ 이미지 로드 실패: {path} - {e_}")
+            self.failures.add(path, "view", e)
+            self.image_bitmap.SetBitmap(wx.NullBitmap)
+            self.resolution_text.SetLabel(f"  ❌ 이미지 로드 실패: {os.path.basename(path)}  ")
+            self.page_label.SetLabel(f"{self.current_image_idx + 1} / {len(self.images)}")
+            self.highlight_thumbnail(self.current_image_idx)
+            self.panel.Layout()
+
+        if self.refine_timer is None:
+            self.prefetch_neighbours()
+
+    def refine_image(self, path, box):
+        """빠른 미리보기로 표시 중인 이미지를 고화질로 만들어 교체합니다. (그 사이 다른 이미지로 넘어갔으면 무시)"""
+        self.refine_timer = None
+        if not self or self.images[self.current_image_idx] != path or self.view_box() != box:
+            return
+        self.prefetch_neighbours(include_current=True)
+        self.view_cache.when_ready(path, box, lambda item: self.on_refined(path, box, item))
 
-                # 이미지 포맷
-                file_format = img.format or os.path.splitext(path)[1][1:].upper().replace('JPG', 'JPEG').replace('WEBP', 'WebP')  # JPG, PNG 등
+    def on_refined(self, path, box, item):
+        if self and self.images and self.images[self.current_image_idx] == path and self.last_view_box == box:
+            self.show_view_image(item)
+            self.panel.Layout()
 
-                # 해상도 + 용량 + 포맷 정보 결합
-                size_label = f"  {original_width}×{original_height}  |  {file_size}  |  {file_format}  "
+    def show_view_image(self, item):
+        size, data, (original_width, original_height, file_size_bytes, file_format) = item
 
-                # 리사이즈 처리
-                panel_width, panel_height = self.panel.GetSize()
-                panel_height -= self.thumbnail_size[1] + 50
+        # 용량 포맷: 1MB 이상이면 MB, 그 외에는 KB로 표시
+        if file_size_bytes >= 1024 * 1024:
+            file_size = f"{file_size_bytes / (1024 * 1024):.1f} MB"
+        else:
+            file_size = f"{file_size_bytes / 1024:.1f} KB"
 
-                scale = min(panel_width / original_width, panel_height / original_height, 1.0)
-                img = img.resize((int(original_width * scale), int(original_height * scale)), PILImage.LANCZOS)
+        # 해상도 + 용량 + 포맷 정보 결합
+        size_label = f"  {original_width}×{original_height}  |  {file_size}  |  {file_format}  "
 
-                wx_img = wx.Image(img.size[0], img.size[1])
-                wx_img.SetData(img.convert("RGB").tobytes())
-                bitmap = wx_img.ConvertToBitmap()
+        wx_img = wx.Image(size[0], size[1])
+        wx_img.SetData(data)
+        bitmap = wx_img.ConvertToBitmap()
 
-                old_bitmap = self.image_bitmap.GetBitmap()
-                if old_bitmap.IsOk():
-                    old_bitmap.Destroy()  # 수동 제거 (옵션)
+        old_bitmap = self.image_bitmap.GetBitmap()
+        if old_bitmap.IsOk():
+            old_bitmap.Destroy()  # 수동 제거 (옵션)
 
-                self.image_bitmap.SetBitmap(bitmap)
-                self.page_label.SetLabel(f"{self.current_image_idx + 1} / {len(self.images)}")
+        self.image_bitmap.SetBitmap(bitmap)
 
-                # 해상도 표시 갱신
-                self.resolution_text.SetLabel(size_label)
+        # 해상도 표시 갱신
+        self.resolution_text.SetLabel(size_label)
 
-                self.prev_btn.Enable(self.current_image_idx > 0)
-                self.next_btn.Enable(self.current_image_idx < len(self.images) - 1)
+    def prefetch_neighbours(self, include_current=False):
+        """현재 이미지의 다음/이전 VIEW_PREFETCH장을 미리 만들어 둡니다. (다음 이미지 우선)"""
+        paths = [self.images[self.current_image_idx]] if include_current else []
+        for step in range(1, VIEW_PREFETCH + 1):
+            for idx in (self.current_image_idx + step, self.current_image_idx - step):
+                if 0 <= idx < len(self.images):
+                    paths.append(self.images[idx])
+        self.view_cache.prefetch(paths, self.view_box())
 
-                self.highlight_thumbnail(self.current_image_idx)
-                self.panel.Layout()
-
-        except Exception as e:
-            e_ = f"{e}".replace("\\\\", "\\")
-            print(f"❌ 이미지 로드 실패: {path} - {e_}")
-            wx.MessageBox(f"❌ 이미지 로드 실패: {os.path.basename(path)}", "오류", wx.ICON_ERROR)
+    def on_size(self, event):
+        event.Skip()
+        # 크기 조절이 끝난 뒤 한 번만 다시 그림 (표시 크기가 바뀌면 캐시는 무효)
+        if self.resize_timer is not None:
+            self.resize_timer.Stop()
+        self.resize_timer = wx.CallLater(200, self.on_resize_done)
+
+    def on_resize_done(self):
+        self.resize_timer = None
+        if self and self.images and self.view_box() != self.last_view_box:
+            self.view_cache.clear()
+            self.load_image()
 
     def show_first_image(self):
         self.current_image_idx = 0
@@ -450,84 +689,185 @@ class ImageViewerFrame(wx.Frame):
             self.load_image()
 
     def highlight_thumbnail(self, idx):
-        for i, thumb in enumerate(self.thumbnails):
-            if i == idx:
-                thumb.SetBackgroundColour(wx.Colour(30, 144, 255))  # DodgerBlue
-            else:
-                thumb.SetBackgroundColour(wx.NullColour)
-            thumb.Refresh()
-
-        # 자동 스크롤 조건 검사 및 실행
-        if not self.is_thumbnail_fully_visible(idx):
-            self.scroll_thumbnail_to_center(idx)
-
-    def scroll_thumbnail_to_center(self, idx):
-        if 0 <= idx < len(self.thumbnails):
-            self.thumb_panel.Layout()
-            wx.Yield()  # 레이아웃 보정
-
-            thumb = self.thumbnails[idx]
-            thumb_width = thumb.GetSize().width
-
-            # 좌표 계산
-            thumb_screen_pos = thumb.ClientToScreen((0, 0))
-            thumb_left = thumb_screen_pos[0] + thumb_width // 2  # 중심 좌표
-
-            panel_screen_pos = self.thumb_panel.ClientToScreen((0, 0))
-            panel_left = panel_screen_pos[0]
-            panel_width = self.thumb_panel.GetClientSize().width
-            panel_center = panel_left + panel_width // 2
-
-            scroll_rate_x, _ = self.thumb_panel.GetScrollPixelsPerUnit()
-
-            # 썸네일 중심과 패널 중심 간 차이 계산
-            delta_px = thumb_left - panel_center
-            current_scroll_px = self.thumb_panel.GetViewStart()[0] * scroll_rate_x
-            target_scroll_px = max(0, current_scroll_px + delta_px)
-            scroll_units = target_scroll_px // scroll_rate_x
-
-            self.thumb_panel.Scroll(scroll_units, 0)
-
-    def is_thumbnail_fully_visible(self, idx):
-        if 0 <= idx < len(self.thumbnails):
-            self.thumb_panel.Layout()  # 레이아웃 갱신 보장
-            wx.Yield()  # GUI 이벤트 강제 반영
-
-            thumb = self.thumbnails[idx]
-            thumb_pos = thumb.ClientToScreen((0, 0))
-            thumb_width = thumb.GetSize().width
-            thumb_left = thumb_pos[0]
-            thumb_right = thumb_left + thumb_width
-
-            panel_pos = self.thumb_panel.ClientToScreen((0, 0))
-            panel_width = self.thumb_panel.GetClientSize().width
-            panel_left = panel_pos[0]
-            panel_right = panel_left + panel_width
-
-            # 디버그 로그
-            # print(f"[검사중] 썸네일 {idx} - left:{thumb_left}, right:{thumb_right}")
-            # print(f"[뷰포트] panel - left:{panel_left}, right:{panel_right}")
-
-            # 오차 허용 범위 (픽셀)
-            tolerance = 1
-
-            # 썸네일이 완전히 뷰포트 안에 들어 있는지 확인
-            return (
-                    thumb_left >= panel_left - tolerance and
-                    thumb_right <= panel_right + tolerance
-            )
-        return False
+        self.thumb_panel.select(idx)
 
     def OnClose(self, event=None):
         self.parent.input_listctrl.Select(self.start_index, on=False)
         self.parent.input_listctrl.Select(self.current_image_idx)
-        for thumb in self.thumbnails:
-            thumb.Destroy()
-        self.thumbnails.clear()
+        self.thumb_panel.clear()
+        if self.failures:
+            self.parent.report_failures(self.failures, VIEWER_FAILURE_REPORT, "이미지 뷰어에서 읽지 못한 파일", show_dialog=False)
+        self.view_cache.shutdown()
+        for timer in (self.resize_timer, self.refine_timer):
+            if timer is not None:
+                timer.Stop()
         self.image_bitmap.SetBitmap(wx.NullBitmap)  # 메모리 해제
         self.Destroy()
 
 
+class InputListCtrl(wx.ListCtrl):
+    """입력 경로 리스트 (가상 리스트)
+
+    행 내용은 경로 목록과 형식 코드 배열에만 보관하고, 화면에 보이는 행만 OnGetItemText로 그립니다.
+    번호 열은 행 위치로 계산하므로 추가/삭제 후 번호를 다시 매길 필요가 없습니다.
+    형식/해상도/용량/원본 복사 열은 보이는 행만 헤더를 읽어(probe_image, 파일별 캐시) 채웁니다.
+    """
+    # 열 번호
+    COL_NO, COL_FORMAT, COL_DIMENSIONS, COL_KB, COL_COPY, COL_PATH = range(6)
+
+    def __init__(self, parent):
+        super().__init__(parent, style=wx.LC_REPORT | wx.LC_VIRTUAL | wx.LC_HRULES | wx.LC_VRULES)
+        self.paths = []  # 파일 경로
+        self.format_codes = bytearray()  # 형식 코드 (format_names의 인덱스)
+        self.format_names = []
+        self.format_index = {}
+        self.infos = {}  # 경로 → 헤더 정보 (읽지 못했으면 None, 그리기 콜백마다 파일을 다시 확인하지 않음)
+        self.copy_rule = None  # '원본 복사' 판단 기준: (최대 너비, 최대 용량(KB), 출력 형식)
+
+    def OnGetItemText(self, item, column):
+        if column == self.COL_NO:
+            return str(item + 1)
+        if column == self.COL_PATH:
+            return self.paths[item]
+
+        path = self.paths[item]
+        info = self.image_info(path)
+        if column == self.COL_FORMAT:
+            if info is None or not info.format:
+                return self.format_names[self.format_codes[item]]  # 확장자 기준
+            return info.format.replace('WEBP', 'WebP')
+        if info is None:
+            return ""
+        if column == self.COL_DIMENSIONS:
+            return f"{info.width}×{info.height}"
+        if column == self.COL_KB:
+            return f"{math.ceil(info.file_size / 1024):,}"
+        if column == self.COL_COPY and self.copy_rule is not None:
+            max_width, max_size_kb, output_format = self.copy_rule
+            output_ext, _ = output_format_for(path, output_format, info.format)
+            return "✓" if is_copy_through(path, output_ext, info.width, info.file_size, max_width, max_size_kb) else ""
+        return ""
+
+    def image_info(self, path):
+        if path not in self.infos:
+            try:
+                self.infos[path] = probe_image(path)
+            except Exception:
+                self.infos[path] = None
+        return self.infos[path]
+
+    def format_code(self, format_name):
+        code = self.format_index.get(format_name)
+        if code is None:
+            code = self.format_index[format_name] = len(self.format_names)
+            self.format_names.append(format_name)
+        return code
+
+    def path(self, idx):
+        return self.paths[idx]
+
+    def format_name(self, idx):
+        return self.format_names[self.format_codes[idx]]
+
+    def append_items(self, items):
+        """(형식, 경로) 항목들을 끝에 추가합니다."""
+        for format_name, path in items:
+            self.paths.append(path)
+            self.format_codes.append(self.format_code(format_name))
+        self.refresh_items()
+
+    def insert_items(self, rows):
+        """삭제했던 (idx, 형식, 경로) 항목들을 원래 위치에 다시 넣습니다."""
+        for idx, format_name, path in sorted(rows):
+            self.paths.insert(idx, path)
+            self.format_codes.insert(idx, self.format_code(format_name))
+        self.refresh_items()
+
+    def delete_items(self, indices):
+        """지정한 행들을 삭제하고, 되돌리기용 (idx, 형식, 경로) 목록을 반환합니다."""
+        indices = sorted(set(indices))
+        deleted = [(idx, self.format_name(idx), self.paths[idx]) for idx in indices]
+        self.clear_selection()
+        if len(indices) <= 64:  # 많이 지울 때는 한 번에 다시 만드는 편이 빠름
+            for idx in reversed(indices):
+                del self.paths[idx]
+                del self.format_codes[idx]
+        else:
+            removed = set(indices)
+            self.paths = [path for idx, path in enumerate(self.paths) if idx not in removed]
+            self.format_codes = bytearray(code for idx, code in enumerate(self.format_codes) if idx not in removed)
+        self.refresh_items()
+        return deleted
+
+    def delete_all(self):
+        """모든 행을 삭제하고, 되돌리기용 (idx, 형식, 경로) 목록을 반환합니다."""
+        deleted = [(idx, self.format_names[code], path) for idx, (code, path) in enumerate(zip(self.format_codes, self.paths))]
+        self.clear_selection()
+        self.paths = []
+        self.format_codes = bytearray()
+        self.refresh_items()
+        return deleted
+
+    def selected_indices(self):
+        indices = []
+        index = self.GetFirstSelected()
+        while index != -1:
+            indices.append(index)
+            index = self.GetNextSelected(index)
+        return indices
+
+    def clear_selection(self):
+        # 가상 리스트의 선택 상태는 행 번호 기준이므로, 행이 밀리기 전에 해제
+        for index in self.selected_indices():
+            self.Select(index, on=False)
+
+    def refresh_items(self):
+        self.SetItemCount(len(self.paths))
+        self.Refresh()
+
+
+class StatusChannel:
+    """작업 스레드의 로그/진행 상황을 모아 두었다가, UI 스레드의 타이머에서 STATUS_FLUSH_MS 간격으로 한꺼번에 반영합니다.
+
+    log/progress는 어느 스레드에서나 호출할 수 있습니다. 쌓인 로그는 on_lines(줄 목록)로 한 번에 넘기고,
+    진행 상황은 마지막 값만 on_progress(완료 수, 전체 수)로 넘기므로 화면 갱신 비용은 처리 속도와 관계없이 일정합니다.
+    """
+    def __init__(self, owner, on_lines, on_progress):
+        self.on_lines = on_lines
+        self.on_progress = on_progress
+        self.lock = threading.Lock()
+        self.lines = []
+        self.last_progress = None
+        self.timer = wx.Timer(owner)
+        owner.Bind(wx.EVT_TIMER, self.flush, self.timer)
+
+    def log(self, message):
+        line = time.strftime("[%H:%M:%S] ") + message  # 시각은 화면에 반영할 때가 아니라 기록할 때 기준
+        with self.lock:
+            self.lines.append(line)
+
+    def progress(self, done, total):
+        with self.lock:
+            self.last_progress = (done, total)
+
+    def start(self):
+        self.timer.Start(STATUS_FLUSH_MS)
+
+    def stop(self):
+        """타이머를 멈추고 남은 내용을 반영합니다. (UI 스레드에서 호출)"""
+        self.timer.Stop()
+        self.flush()
+
+    def flush(self, event=None):
+        with self.lock:
+            lines, self.lines = self.lines, []
+            last_progress, self.last_progress = self.last_progress, None
+        if lines:
+            self.on_lines(lines)
+        if last_progress is not None:
+            self.on_progress(*last_progress)
+
+
 class FileDropHandler(wx.FileDropTarget):
     def __init__(self, listbox, callback):
         super().__init__()
@@ -613,6 +953,12 @@ class HelpCenterDialog(wx.Dialog):
             "- PNG: 투명도 지원, 무손실 압축\n"
             "- WebP: 고압축 + 투명도 지원 (권장)\n"
             "- TIFF, BMP 등은 일부 환경에서 제한됨.\n\n"
+            "🔹 병렬 작업\n"
+            "동시에 처리할 이미지 수(프로세스 수)입니다. 기본값은 CPU의 물리 코어 수이며, 1로 지정하면 한 장씩 순서대로 처리합니다. 처리 결과는 병렬 작업 수와 관계없이 입력 순서대로 표시됩니다.\n\n"
+            "🔹 압축 노력 (WebP, AVIF)\n"
+            "빠름/균형/최고 중에서 인코딩 속도와 압축 효율을 선택합니다. '최고'는 같은 화질에서 용량이 가장 작지만 가장 느립니다. 용량 우선 모드의 화질 탐색은 항상 빠른 설정으로 하고, 최종 선택된 화질만 선택한 단계로 저장합니다.\n\n"
+            "🔹 원본 저장\n"
+            "리사이징/압축 없이 원본 그대로 저장하는 이미지의 저장 방식입니다. '복사'는 파일 내용을 모두 복사합니다. '복제(reflink)'는 지원하는 파일 시스템(Btrfs, XFS 등)에서 데이터를 공유하는 복제본을 만들어 거의 즉시 끝나며, 지원하지 않으면 복사합니다. '하드 링크'는 같은 드라이브에서 데이터를 쓰지 않고 원본과 같은 파일을 출력 폴더에 연결하므로 가장 빠르지만, 출력 파일을 다른 프로그램에서 수정하면 원본도 함께 바뀝니다. (다른 드라이브면 복사)\n\n"
             "💡 원본의 너비가 최대 너비보다 작고 용량 또한 최대 용량보다 작으면 리사이징/압축 없이 원본 그대로 저장됩니다.\n"
         )
 
@@ -624,7 +970,13 @@ class HelpCenterDialog(wx.Dialog):
             "🔹 저장 폴더의 자동 지정\n"
             "입력 경로의 첫 번째 이미지가 있는 폴더 아래의 '출력' 폴더로 지정됩니다. 물론, '폴더 선택' 버튼을 클릭해 다른 폴더로 변경할 수 있습니다.\n\n"
             "🔹 저장 폴더의 자동 생성\n"
-            "저장 폴더가 존재하지 않는 경우 자동으로 생성됩니다. 생성 또는 저장 실패 시 권한 문제일 수 있습니다.\n"
+            "저장 폴더가 존재하지 않는 경우 자동으로 생성됩니다. 생성 또는 저장 실패 시 권한 문제일 수 있습니다.\n\n"
+            "🔹 변경된 이미지만 처리\n"
+            "저장 폴더에 처리 기록(.k-imageresizer-manifest.json)을 남기고, 다음 실행 때 원본(크기, 수정 시각)과 설정이 그대로이며 출력 파일도 남아 있는 이미지는 건너뜁니다. 이 옵션을 켜면 '저장 폴더 비우고 시작'은 적용되지 않습니다.\n\n"
+            "🔹 인코딩 캐시\n"
+            "변환 결과를 사용자 폴더(.k-imageresizer\\cache)에 보관해 두고, 내용이 같은 원본을 같은 설정으로 다시 변환할 때는 인코딩 없이 캐시된 결과를 출력 폴더로 복사(같은 드라이브면 하드링크)합니다. 입력 폴더가 달라도 내용이 같으면 재사용되며, 캐시 용량이 한도(기본 1024MB)를 넘으면 오래 사용하지 않은 항목부터 삭제됩니다.\n\n"
+            "🔹 실패 목록\n"
+            "처리하지 못한 파일이 있어도 처리를 멈추지 않고 끝까지 진행한 뒤, 실패한 파일과 단계(열기, 압축, 저장 등), 오류 내용을 한 번에 보여 줍니다. 같은 내용이 저장 폴더에 .k-imageresizer-failures.json / .csv 파일로 저장됩니다.\n"
         )
     def get_input_help(self):
         return (
@@ -633,6 +985,8 @@ class HelpCenterDialog(wx.Dialog):
             "하나 이상의 이미지 파일을 선택합니다.\n\n"
             "🔹 폴더 추가\n"
             "선택한 폴더 내 이미지들을 자동으로 목록에 추가합니다.\n\n"
+            "🔹 하위 폴더 포함\n"
+            "폴더를 추가하거나 끌어다 놓을 때 하위 폴더의 이미지까지 모두 추가합니다. 저장할 때도 원본의 폴더 구조를 출력 폴더 아래에 그대로 만들어 저장하며, 출력 폴더 자체는 탐색에서 제외됩니다. 확장자가 없는 파일은 파일 앞부분을 읽어 이미지인지 확인합니다.\n\n"
             "🔹 드래그 앤 드롭\n"
             "이미지 파일 또는 폴더를 목록에 직접 끌어다 놓을 수 있습니다.\n\n"
             "🔹 중복 삭제\n"
@@ -678,7 +1032,8 @@ class ImageResizerFrame(wx.Frame):
         ##self.thumbnail_size = (60, 60)
         self.input_paths = []
         self.undo_stack = []  # 삭제 기록 저장 (idx, path)
-        self.stop_requested = False
+        self.input_path_keys = set()  # 입력 목록의 정규화 경로 (중복 확인용, 목록과 항상 같이 갱신)
+        self.stop_event = multiprocessing.Event()  # 중지 요청 (프로세스 풀 작업자와 공유)
         self.pids_explorer_existing = []
 
         # 설정 값 로드
@@ -693,11 +1048,14 @@ class ImageResizerFrame(wx.Frame):
 
         self.input_path_label = wx.StaticText(self.panel, label="입력 경로: 0개의 이미지")
 
-        self.input_listctrl = wx.ListCtrl(self.panel, style=wx.LC_REPORT | wx.LC_HRULES | wx.LC_VRULES)
+        self.input_listctrl = InputListCtrl(self.panel)
         self.input_listctrl.SetMinSize((300, 235))
-        self.input_listctrl.InsertColumn(0, "#", width=35)
-        self.input_listctrl.InsertColumn(1, "형식", width=45)
-        self.input_listctrl.InsertColumn(2, "파일 경로", width=1000)
+        self.input_listctrl.InsertColumn(InputListCtrl.COL_NO, "#", width=35)
+        self.input_listctrl.InsertColumn(InputListCtrl.COL_FORMAT, "형식", width=45)
+        self.input_listctrl.InsertColumn(InputListCtrl.COL_DIMENSIONS, "해상도", width=80)
+        self.input_listctrl.InsertColumn(InputListCtrl.COL_KB, "KB", width=55, format=wx.LIST_FORMAT_RIGHT)
+        self.input_listctrl.InsertColumn(InputListCtrl.COL_COPY, "원본 복사", width=60, format=wx.LIST_FORMAT_CENTRE)
+        self.input_listctrl.InsertColumn(InputListCtrl.COL_PATH, "파일 경로", width=1000)
 
         self.input_listctrl.Bind(wx.EVT_LIST_ITEM_ACTIVATED, self.on_input_file_double_click)
 
@@ -713,6 +1071,10 @@ class ImageResizerFrame(wx.Frame):
         self.input_folder_button = wx.Button(self.panel, label="폴더 추가")
         self.input_folder_button.Bind(wx.EVT_BUTTON, self.browse_input_folder)
 
+        # 체크박스: 하위 폴더 포함 (폴더 추가/드롭 시 하위 폴더까지, 저장 시 같은 폴더 구조로)
+        self.recursive_checkbox = wx.CheckBox(self.panel, label="하위 폴더 포함")
+        self.recursive_checkbox.SetValue(self.settings["recursive"])
+
         self.remove_selected_button = wx.Button(self.panel, label="선택 삭제")
         self.remove_selected_button.Bind(wx.EVT_BUTTON, self.remove_selected_items)
 
@@ -729,6 +1091,14 @@ class ImageResizerFrame(wx.Frame):
         self.clear_folder_checkbox = wx.CheckBox(self.panel, label="저장 폴더 비우고 시작")
         self.clear_folder_checkbox.SetValue(self.settings["clear_folder"])
 
+        # 체크박스: 변경된 이미지만 처리 (증분 처리, 저장 폴더 비우기보다 우선)
+        self.incremental_checkbox = wx.CheckBox(self.panel, label="변경된 이미지만 처리")
+        self.incremental_checkbox.SetValue(self.settings["incremental"])
+
+        # 체크박스: 인코딩 캐시 사용 (같은 원본/설정의 이전 결과 재사용)
+        self.cache_checkbox = wx.CheckBox(self.panel, label="인코딩 캐시")
+        self.cache_checkbox.SetValue(self.settings["encode_cache"])
+
         self.output_button = wx.Button(self.panel, label="폴더 선택")
         self.output_button.Bind(wx.EVT_BUTTON, self.browse_output)
 
@@ -787,6 +1157,22 @@ class ImageResizerFrame(wx.Frame):
             self.mode_radio2.Disable()
 
         self.format_menu.Bind(wx.EVT_COMBOBOX, self.on_select)
+        self.update_copy_rule()
+
+        # 병렬 작업 수 (1이면 단일 스레드 처리)
+        self.jobs_label = wx.StaticText(self.panel, label="병렬 작업:")
+        self.jobs_entry = FloatSpin(self.panel, min_val=1, max_val=os.cpu_count() or 1, increment=1, value=self.settings["jobs"], digits=0, size=(50, -1))
+        self.jobs_entry.Bind(wx.EVT_TEXT, self.on_text_change)
+
+        # 인코딩 노력 단계 (WebP/AVIF)
+        self.effort_label = wx.StaticText(self.panel, label="압축 노력:")
+        self.effort_menu = wx.ComboBox(self.panel, choices=list(EFFORT_LABELS.values()), style=wx.CB_READONLY)
+        self.effort_menu.SetValue(EFFORT_LABELS[self.settings["effort"]])
+
+        # 원본 그대로 저장하는 이미지의 저장 방식
+        self.copy_label = wx.StaticText(self.panel, label="원본 저장:")
+        self.copy_menu = wx.ComboBox(self.panel, choices=list(COPY_STRATEGY_LABELS.values()), style=wx.CB_READONLY)
+        self.copy_menu.SetValue(COPY_STRATEGY_LABELS[self.settings["copy_strategy"]])
 
         # 메인 수직 레이아웃에 추가
         # 상태 표시 & 진행바
@@ -796,6 +1182,9 @@ class ImageResizerFrame(wx.Frame):
 
         self.progress = wx.Gauge(self.panel, range=100, size=(300, -1))
 
+        # 작업 스레드 → UI 로그/진행 상황 전달
+        self.status_channel = StatusChannel(self, self.append_status_lines, self.update_progress)
+
         # ▶ 실행 버튼
         self.process_button = wx.Button(self.panel, label="▶ 이미지 처리 시작")
         self.process_button.Bind(wx.EVT_BUTTON, self.on_process_button_clicked)
@@ -816,6 +1205,7 @@ class ImageResizerFrame(wx.Frame):
         block_b.AddSpacer(20)  # self.input_file_button 상단 위치 조정
         block_b.Add(self.input_file_button, 0, wx.BOTTOM | wx.EXPAND, 5)
         block_b.Add(self.input_folder_button, 0, wx.BOTTOM | wx.EXPAND, 5)
+        block_b.Add(self.recursive_checkbox, 0, wx.BOTTOM, 5)
         block_b.Add(self.remove_selected_button, 0, wx.BOTTOM | wx.EXPAND, 5)
         block_b.Add(self.clear_list_button, 0, wx.BOTTOM | wx.EXPAND, 5)
         block_b.Add(self.undo_btn, 0, wx.BOTTOM | wx.EXPAND, 5)
@@ -849,6 +1239,14 @@ class ImageResizerFrame(wx.Frame):
 
         process = wx.BoxSizer(wx.HORIZONTAL)
         process.Add(self.clear_folder_checkbox, 0, wx.ALIGN_CENTER_VERTICAL | wx.LEFT, 10)
+        process.Add(self.incremental_checkbox, 0, wx.ALIGN_CENTER_VERTICAL | wx.LEFT, 10)
+        process.Add(self.cache_checkbox, 0, wx.ALIGN_CENTER_VERTICAL | wx.LEFT, 10)
+        process.Add(self.jobs_label, 0, wx.ALIGN_CENTER_VERTICAL | wx.LEFT | wx.RIGHT, 8)
+        process.Add(self.jobs_entry, 0, wx.ALIGN_CENTER_VERTICAL)
+        process.Add(self.effort_label, 0, wx.ALIGN_CENTER_VERTICAL | wx.LEFT | wx.RIGHT, 8)
+        process.Add(self.effort_menu, 0, wx.ALIGN_CENTER_VERTICAL)
+        process.Add(self.copy_label, 0, wx.ALIGN_CENTER_VERTICAL | wx.LEFT | wx.RIGHT, 8)
+        process.Add(self.copy_menu, 0, wx.ALIGN_CENTER_VERTICAL)
         process.Add(self.process_button, 1, wx.EXPAND | wx.LEFT, 8)
 
         self.sizer = wx.BoxSizer(wx.VERTICAL)
@@ -920,9 +1318,19 @@ class ImageResizerFrame(wx.Frame):
             self.mode_radio1.Enable()
             self.mode_radio2.Enable()
 
+        self.update_copy_rule()
+
     def get_selected_mode(self):
         return 1 if self.mode_radio1.GetValue() else 0
 
+    def get_selected_effort(self):
+        label = self.effort_menu.GetValue()
+        return next((effort for effort, name in EFFORT_LABELS.items() if name == label), DEFAULT_EFFORT)
+
+    def get_selected_copy_strategy(self):
+        label = self.copy_menu.GetValue()
+        return next((strategy for strategy, name in COPY_STRATEGY_LABELS.items() if name == label), DEFAULT_COPY_STRATEGY)
+
     def on_text_change(self, event):
         textctrl = event.GetEventObject()
         value = textctrl.GetValue()
@@ -934,6 +1342,16 @@ class ImageResizerFrame(wx.Frame):
             textctrl.SetBackgroundColour("pink")
 
         textctrl.Refresh()
+        self.update_copy_rule()
+
+    def update_copy_rule(self):
+        """입력 목록의 '원본 복사' 열 판단 기준을 현재 최대 너비/최대 용량/출력 형식으로 갱신합니다."""
+        try:
+            rule = (int(self.width_entry.GetValue()), int(self.size_entry.GetValue()), self.format_menu.GetValue())
+        except ValueError:
+            rule = None
+        self.input_listctrl.copy_rule = rule
+        self.input_listctrl.Refresh()
 
     def on_quality_change(self, event):
         """Quality 입력값 검증: 1~100 정수, 앞자리 0 금지"""
@@ -954,7 +1372,7 @@ class ImageResizerFrame(wx.Frame):
             self.on_stop_clicked(event)
 
     def on_stop_clicked(self, event=None):
-        self.stop_requested = True
+        self.stop_event.set()
         self.log_status("⏹ 처리 중지 요청됨.")
         self.process_button.SetLabel("▶ 이미지 처리 시작")
 
@@ -968,17 +1386,22 @@ class ImageResizerFrame(wx.Frame):
             wx.MessageBox("되돌릴 삭제 항목이 없습니다.", "정보", wx.ICON_INFORMATION)
             return
 
-        deleted = self.undo_stack.pop()
-        for idx, format_name, path in sorted(deleted):
-            self.input_listctrl.InsertItem(idx, str(idx + 1))
-            self.input_listctrl.SetItem(idx, 1, format_name)
-            self.input_listctrl.SetItem(idx, 2, path)
-
-        # 번호 다시 매기기
-        for i in range(self.input_listctrl.GetItemCount()):
-            self.input_listctrl.SetItem(i, 0, str(i + 1))
+        self.restore_rows(self.undo_stack.pop())
 
         #### 썸네일self.update_list_thumbnails()
+
+    def restore_rows(self, rows):
+        """삭제했던 (위치, 형식, 경로) 행들을 입력 목록에 되살립니다.
+
+        삭제한 뒤 다시 추가된 경로는 건너뜁니다. (추가할 때와 같은 중복 확인)
+        """
+        restored = []
+        for row in rows:
+            key = normalize_path(row[2])
+            if key not in self.input_path_keys:
+                self.input_path_keys.add(key)
+                restored.append(row)
+        self.input_listctrl.insert_items(restored)
         self.update_input_path_label()
 
     """ 썸네일
@@ -1072,40 +1495,47 @@ class ImageResizerFrame(wx.Frame):
         timestamp = time.strftime("[%H:%M:%S] ")
         if clear:
             self.status_text.SetValue("")  # 로그 전체 지우기
-        self.status_text.AppendText(timestamp + message + "\n")
+        self.append_status_lines([timestamp + message])
+
+    def append_status_lines(self, lines):
+        self.status_text.AppendText("\n".join(lines) + "\n")
         self.status_text.ShowPosition(self.status_text.GetLastPosition())  # 자동 스크롤
 
+    def update_progress(self, done, total):
+        self.progress.SetRange(max(1, total))
+        self.progress.SetValue(done)
+
     def open_help_center(self, event):
         dlg = HelpCenterDialog(self)
         dlg.ShowModal()
 
     def handle_dropped_files(self, file_paths):
-        image_extensions = ('.jpg', '.jpeg', '.png', '.tiff', '.webp', '.bmp', '.avif', '.gif', '.ico')
-        existing_items = [self.input_listctrl.GetItemText(i, 2) for i in range(self.input_listctrl.GetItemCount())]
+        # 드롭한 폴더는 폴더 추가와 같은 방식으로 펼침
+        recursive = self.recursive_checkbox.IsChecked()
+        exclude = [self.output_path_text.GetValue()] if self.output_path_text.GetValue() else []
+        self.add_input_paths(path for path, _ in scan_image_files(file_paths, recursive, exclude) if is_image_file(path))
 
+    def add_input_paths(self, paths):
+        """이미지 경로들을 입력 목록 끝에 추가합니다. 이미 있는 경로(정규화 경로 기준)는 건너뛰고 알립니다."""
         new_items = []
-        duplicate_items = []
-
-        for path in file_paths:
-            if not path.lower().endswith(image_extensions):
+        duplicate_count = 0
+        for path in paths:
+            key = normalize_path(path)
+            if key in self.input_path_keys:
+                duplicate_count += 1
                 continue
-            if path not in existing_items:
-                new_items.append(path)
-            else:
-                duplicate_items.append(path)
+            self.input_path_keys.add(key)
+            new_items.append(path)
 
-        if duplicate_items:
-            wx.MessageBox(f"{len(duplicate_items)}개의 파일은 이미 추가되어 있습니다.", "중복 항목", wx.ICON_INFORMATION)
+        if duplicate_count:
+            wx.MessageBox(f"{duplicate_count}개의 파일은 이미 추가되어 있습니다.", "중복 항목", wx.ICON_INFORMATION)
 
         if new_items:
-            for path in new_items:
-                index = self.input_listctrl.GetItemCount()
-                ext = os.path.splitext(path)[1].lower().replace('.', '')
-                format_name = ext.upper().replace('JPG', 'JPEG').replace('WEBP', 'WebP')
-
-                self.input_listctrl.InsertItem(index, str(index + 1))
-                self.input_listctrl.SetItem(index, 1, format_name)
-                self.input_listctrl.SetItem(index, 2, path)
+            # 파일 형식 추출 (예: JPEG, PNG, WebP)
+            self.input_listctrl.append_items(
+                (os.path.splitext(path)[1].lower().replace('.', '').upper().replace('JPG', 'JPEG').replace('WEBP', 'WebP'), path)
+                for path in new_items
+            )
 
             Toast(self, f"{len(new_items)}개 추가됨.", 1000)
             self.update_input_path_label()
@@ -1120,29 +1550,17 @@ class ImageResizerFrame(wx.Frame):
             wx.MessageBox("유효한 출력 폴더가 설정되어 있지 않습니다.", "알림", wx.ICON_INFORMATION)
 
     def remove_selected_items(self, event):
-        selected_indices = []
-        index = self.input_listctrl.GetFirstSelected()
-        while index != -1:
-            selected_indices.append(index)
-            index = self.input_listctrl.GetNextSelected(index)
-
+        selected_indices = self.input_listctrl.selected_indices()
         if not selected_indices:
             wx.MessageBox("삭제할 항목을 선택하세요.", "알림", wx.ICON_INFORMATION)
             return
 
-        deleted = []
-        for idx in reversed(selected_indices):
-            format_name = self.input_listctrl.GetItemText(idx, 1)
-            path = self.input_listctrl.GetItemText(idx, 2)
-            deleted.append((idx, format_name, path))
-            self.input_listctrl.DeleteItem(idx)
+        deleted = self.input_listctrl.delete_items(selected_indices)
+        for _, _, path in deleted:
+            self.input_path_keys.discard(normalize_path(path))
 
         self.undo_stack.append(deleted)
 
-        # 번호 다시 매기기
-        for i in range(self.input_listctrl.GetItemCount()):
-            self.input_listctrl.SetItem(i, 0, str(i + 1))
-
         Toast(self, f"{len(selected_indices)}개 삭제됨")
         self.update_input_path_label()
         #### 썸네일self.update_list_thumbnails()
@@ -1153,13 +1571,8 @@ class ImageResizerFrame(wx.Frame):
             wx.MessageBox("입력경로 목록이 비었습니다.", "알림", wx.ICON_INFORMATION)
             return
 
-        deleted = []
-        for idx in range(item_count):
-            format_name = self.input_listctrl.GetItemText(idx, 1)
-            path = self.input_listctrl.GetItemText(idx, 2)
-            deleted.append((idx, format_name, path))
-
-        self.input_listctrl.DeleteAllItems()
+        deleted = self.input_listctrl.delete_all()
+        self.input_path_keys.clear()
         self.undo_stack.append(deleted)
         self.update_input_path_label()
         #### 썸네일self.update_list_thumbnails()
@@ -1172,52 +1585,14 @@ class ImageResizerFrame(wx.Frame):
         menu.Destroy()
 
     def browse_input_folder(self, event):
-        image_extensions = ('.jpg', '.jpeg', '.png', '.tiff', '.webp', '.bmp', '.avif', '.gif', '.ico')
 
         with wx.DirDialog(self, "입력 폴더 선택", style=wx.DD_DEFAULT_STYLE) as dirDialog:
             if dirDialog.ShowModal() == wx.ID_OK:
                 folder_path = dirDialog.GetPath()
 
-                image_files = []
-                for filename in os.listdir(folder_path):
-                    full_path = os.path.join(folder_path, filename)
-                    if os.path.isfile(full_path) and full_path.lower().endswith(image_extensions):
-                        image_files.append(full_path)
-
-                # 기존 리스트 항목 가져오기 (파일 경로만 추출)
-                existing_items = [
-                    self.input_listctrl.GetItem(i, 2).GetText()
-                    for i in range(self.input_listctrl.GetItemCount())
-                ]
-
-                # 중복 확인
-                new_items = []
-                duplicate_items = []
-
-                for path in image_files:
-                    if path not in existing_items:
-                        new_items.append(path)
-                    else:
-                        duplicate_items.append(path)
-
-                if duplicate_items:
-                    msg = f"{len(duplicate_items)}개의 파일은 이미 추가되어 있습니다."
-                    wx.MessageBox(msg, "중복 항목", wx.ICON_INFORMATION)
-
-                if new_items:
-                    current_count = self.input_listctrl.GetItemCount()
-                    for i, path in enumerate(new_items):
-                        index = current_count + i
-                        # 파일 형식 추출 (예: JPEG, PNG, WebP)
-                        ext = os.path.splitext(path)[1].lower().replace('.', '')  # 확장자만
-                        format_name = ext.upper().replace('JPG', 'JPEG').replace('WEBP', 'WebP')
-                        self.input_listctrl.InsertItem(index, str(index + 1))  # 번호 열
-                        self.input_listctrl.SetItem(index, 1, format_name)
-                        self.input_listctrl.SetItem(index, 2, path)  # 파일 경로 열
-
-                    Toast(self, f"{len(new_items)}개 추가됨.", 1000)
-                    self.update_input_path_label()
-                    #### 썸네일self.update_list_thumbnails()
+                recursive = self.recursive_checkbox.IsChecked()
+                exclude = [self.output_path_text.GetValue()] if self.output_path_text.GetValue() else []
+                self.add_input_paths(path for path, _ in scan_image_files([folder_path], recursive, exclude))
 
     def browse_input_file(self, event):
         with wx.FileDialog(
@@ -1227,49 +1602,14 @@ class ImageResizerFrame(wx.Frame):
                 style=wx.FD_OPEN | wx.FD_FILE_MUST_EXIST | wx.FD_MULTIPLE
         ) as fileDialog:
             if fileDialog.ShowModal() == wx.ID_OK:
-                file_paths = fileDialog.GetPaths()
-
-                # 기존 항목 추출 (파일 경로 기준)
-                existing_items = [
-                    self.input_listctrl.GetItem(i, 2).GetText()  # 두 번째 열: 파일 경로
-                    for i in range(self.input_listctrl.GetItemCount())
-                ]
-
-                # 중복 확인
-                new_items = []
-                duplicate_items = []
-
-                for path in file_paths:
-                    if path not in existing_items:
-                        new_items.append(path)
-                    else:
-                        duplicate_items.append(path)
-
-                if duplicate_items:
-                    msg = f"{len(duplicate_items)}개의 파일은 이미 추가되어 있습니다."
-                    wx.MessageBox(msg, "중복 항목", wx.ICON_INFORMATION)
-
-                if new_items:
-                    current_count = self.input_listctrl.GetItemCount()
-                    for i, path in enumerate(new_items):
-                        index = current_count + i
-                        # 파일 형식 추출 (예: JPEG, PNG, WebP)
-                        ext = os.path.splitext(path)[1].lower().replace('.', '')  # 확장자만
-                        format_name = ext.upper().replace('JPG', 'JPEG').replace('WEBP', 'WebP')
-                        self.input_listctrl.InsertItem(index, str(index + 1))  # 열 0: 번호
-                        self.input_listctrl.SetItem(index, 1, format_name)
-                        self.input_listctrl.SetItem(index, 2, path)  # 열 1: 파일 경로
-
-                    Toast(self, f"{len(new_items)}개 추가됨.", 1000)
-                    self.update_input_path_label()
-                    #### 썸네일self.update_list_thumbnails()
+                self.add_input_paths(fileDialog.GetPaths())
 
     def update_input_path_label(self):
         count = self.input_listctrl.GetItemCount()
         self.input_path_label.SetLabel(f"입력 경로: {count}개의 이미지")
 
         if count > 0:
-            first_path = self.input_listctrl.GetItemText(0, 2)
+            first_path = self.input_listctrl.path(0)
             if os.path.isfile(first_path):
                 base_folder = os.path.dirname(first_path)
             elif os.path.isdir(first_path):
@@ -1291,255 +1631,56 @@ class ImageResizerFrame(wx.Frame):
             self.process_button.SetDefault()  # ✅ Enter 키 기본 동작으로 설정
         dialog.Destroy()
 
-    def resize_image_keep_ratio(self, img, base_width):
-        if img.width <= base_width:
-            return img
-        w_percent = base_width / float(img.size[0])
-        h_size = int(float(img.size[1]) * w_percent)
-        return img.resize((base_width, h_size), PILImage.LANCZOS)
-
-    def compress_and_save(self, img, output_path, format_name, min_quality, max_kb, mode):
-        def get_size_kb(path):
-            return os.path.getsize(path) / 1024
-
-        mid = None
-        best_params = None
-
-        if format_name in ["JPEG", "JPG"]:
-            if mode == 1:
-                try:
-                    img.save(output_path, format="JPEG", quality=min_quality, optimize=True)
-                except OSError:
-                    img.save(output_path, format="JPEG", quality=min_quality)
-
-                size_kb = get_size_kb(output_path)
-                return f"[화질 우선] quality={min_quality}, size={round(size_kb)}KB"
-            else:
-                min_quality = 1 # 용량 우선이므로 화질을 1로 간주
-                low, high = 10, 100
-                while low <= high:
-                    if self.stop_requested:
-                        return
-                    mid = (low + high) // 2
-                    if mid < min_quality:
-                        low = mid + 1
-                        continue
-
-                    try:
-                        img.save(output_path, format="JPEG", quality=mid, optimize=True)
-                    except OSError:
-                        img.save(output_path, format="JPEG", quality=mid)
-
-                    size_kb = get_size_kb(output_path)
-                    if size_kb <= max_kb:
-                        best_params = mid
-                        low = mid + 1
-                    else:
-                        high = mid - 1
-
-                if best_params:
-                    img.save(output_path, format="JPEG", quality=best_params, optimize=True)
-                    return f"[용량 우선] quality={best_params}, size={round(get_size_kb(output_path))}KB"
-                else:
-                    return f"최적 품질 찾기 실패 (마지막 시도: quality={mid})"
-
-        elif format_name == "PNG":
-            compress_level = 9
-            try:
-                img.save(output_path, format="PNG", compress_level=compress_level, optimize=True)
-            except OSError:
-                img.save(output_path, format="PNG", compress_level=compress_level)
-
-            return f"[무손실] compress_level={compress_level}, size={round(get_size_kb(output_path))}KB"
-
-        elif format_name == "WebP":
-            if mode == 1:
-                try:
-                    img.save(output_path, format="WebP", quality=min_quality, method=6)
-                except OSError:
-                    img.save(output_path, format="WebP", quality=min_quality)
-
-                return f"[화질 우선] quality={min_quality}, size={round(get_size_kb(output_path))}KB"
-            else:
-                min_quality = 1 # 용량 우선이므로 화질을 1로 간주
-                low, high = 10, 100
-                while low <= high:
-                    if self.stop_requested:
-                        return
-
-                    mid = (low + high) // 2
-                    if mid < min_quality:
-                        low = mid + 1
-                        continue
-
-                    try:
-                        img.save(output_path, format="WebP", quality=mid, method=6)
-                    except OSError:
-                        img.save(output_path, format="WebP", quality=mid)
-
-                    size_kb = get_size_kb(output_path)
-                    if size_kb <= max_kb:
-                        best_params = mid
-                        low = mid + 1
-                    else:
-                        high = mid - 1
-
-                if best_params:
-                    img.save(output_path, format="WebP", quality=best_params, method=6)
-                    return f"[용량 우선] quality={best_params}, size={round(get_size_kb(output_path))}KB"
-
-        elif format_name == "AVIF":
-            if mode == 1:
-                try:
-                    img.save(output_path, format="AVIF", quality=min_quality, speed=0)
-                    return f"[화질 우선] quality={min_quality}, size={round(get_size_kb(output_path))}KB"
-                except Exception as e:
-                    print(f"AVIF 저장 실패: {e}")
-                    self.log_status(f"AVIF 저장 실패: {e}")
-                    return False
-            else:
-                min_quality = 1 # 용량 우선이므로 화질을 1로 간주
-                low, high = 10, 100
-                while low <= high:
-                    if self.stop_requested:
-                        return
-
-                    mid = (low + high) // 2
-                    if mid < min_quality:
-                        low = mid + 1
-                        continue
-
-                    try:
-                        img.save(output_path, format="AVIF", quality=mid, speed=0)
-                    except Exception as e:
-                        print(f"AVIF 저장 실패: {e}")
-                        self.log_status(f"AVIF 저장 실패: {e}")
-                        break
-
-                    if get_size_kb(output_path) <= max_kb:
-                        best_params = mid
-                        low = mid + 1
-                    else:
-                        high = mid - 1
-
-                if best_params:
-                    img.save(output_path, format="AVIF", quality=best_params, speed=0)
-                    return f"[용량 우선] quality={best_params}, size={round(get_size_kb(output_path))}KB"
-
-        elif format_name == "TIFF":
-            try:
-                img.save(output_path, format="TIFF", compression="tiff_lzw")
-                return f"compression=tiff_lzw, size={round(get_size_kb(output_path))}KB"
-            except Exception as e:
-                print(f"TIFF 저장 실패: {e}")
-                self.log_status(f"TIFF 저장 실패: {e}")
-                return False
-
-        elif format_name == "BMP":
-            try:
-                img.save(output_path, format="BMP")
-                return f"[무압축] size={round(get_size_kb(output_path))}KB"
-            except Exception as e:
-                print(f"BMP 저장 실패: {e}")
-                self.log_status(f"BMP 저장 실패: {e}")
-                return False
-
-        else:
-            try:
-                img.save(output_path, format=format_name)
-                return f"[무압축] size={round(get_size_kb(output_path))}KB"
-            except Exception as e:
-                print(f"저장 실패 ({format_name}): {e}")
-                self.log_status(f"저장 실패 ({format_name}): {e}")
-                return False
-
-    def process_images(self, input_paths, output_folder, max_width, min_quality, max_size_kb, output_format, mode):
-        self.stop_requested = False  # 시작 전 초기화
-        image_files = []
-
-        for input_path in input_paths:
-            if os.path.isfile(input_path):
-                image_files.append(input_path)
-            elif os.path.isdir(input_path):
-                image_files.extend([
-                    os.path.join(input_path, f)
-                    for f in os.listdir(input_path)
-                    if f.lower().endswith((".jpg", ".jpeg", ".png", ".webp"))
-                ])
-
-        self.progress.SetRange(len(image_files))
-        processed = 0
-
-        for idx, input_file in enumerate(image_files):
-            if self.stop_requested:
-                break
-
-            input_ext = os.path.splitext(os.path.basename(input_file))[1]
-            if output_format == '원본 유지':
-                output_name = os.path.basename(input_file)
-            else:
-                output_name = os.path.splitext(os.path.basename(input_file))[0] + "." + output_format.lower()
-
-            output_path = os.path.join(output_folder, output_name)
-            output_path = normalize_extension(output_path, output_format)
-            try:
-                with PILImage.open(input_file) as img:
-                    img = ImageOps.exif_transpose(img)
-
-                    if img.mode != 'RGB':
-                        img = img.convert('RGB')
-
-                    # ✅ 원본 유지 조건: 입/출력 동일 형식 & 너비,용량 모두 기준 이하
-                    input_ext_ = input_ext.replace('.', '').lower().replace('jpeg', 'jpg')
-                    if output_format == '원본 유지':
-                        output_ext = os.path.splitext(os.path.basename(input_file))[1].replace('.', '')
-                        output_format_ = output_ext.upper().replace('JPG', 'JPEG').replace('WEBP', 'WebP')
-                    else:
-                        output_ext = output_format.lower().replace('jpeg', 'jpg')
-                        output_format_ = output_format
-
-                    if input_ext_ == output_ext and img.width <= max_width and os.path.getsize(input_file) <= max_size_kb * 1024:
-                        shutil.copy2(input_file, output_path)
-                        processed += 1
-                        print(f"{idx+1}. ⮕ ✅ 원본 복사:	{os.path.basename(output_path)}")
-                        self.log_status(f"{idx+1}. ⮕ ✅ 원본 복사:			{os.path.basename(output_path)}")
-
-                    else:
-                        img = self.resize_image_keep_ratio(img, max_width)
-                        success = self.compress_and_save(img, output_path, output_format_, min_quality, max_size_kb, mode)
-
-                        if success:
-                            processed += 1
-                            self.log_status(f"{idx+1}. ⮕ {success}:	{os.path.basename(output_path)}")
-                        else:
-                            print(f"{idx+1}. ⮕ ⚠️ 압축 실패: {input_file}")
-                            self.log_status(f"{idx+1}. ⮕ ⚠️ 압축 실패: {input_file}")
-
-
-            except Exception as e:
-                e_ = f"{e}".replace("\\\\", "\\")
-                print(f"{idx+1}. ⮕ ❌ 오류: {input_file} - {e_}")
-                self.log_status(f"{idx+1}. ⮕ ❌ 오류: {input_file} - {e_}")
-                wx.MessageBox(f"{idx+1}. ⮕ ❌ 오류: {os.path.basename(input_file)}", "오류", wx.ICON_ERROR)
+    def process_images(self, input_paths, output_folder, max_width, min_quality, max_size_kb, output_format, mode, jobs=1, effort=DEFAULT_EFFORT,
+                       incremental=False, cache_dir=None, stats=None, recursive=False, copy_strategy=DEFAULT_COPY_STRATEGY,
+                       failures=None, clear_output=False):
+        """작업 스레드에서 실행됩니다. 로그와 진행 상황은 status_channel을 거쳐 UI 스레드에서 반영됩니다.
 
+        clear_output이면 처리 전에 저장 폴더를 비웁니다. (파일이 많으면 오래 걸리므로 UI 스레드에서 하지 않음)
+        """
+        if clear_output:
+            clear_folder(output_folder, on_error=lambda file_path, e: failures.add(file_path, "clear", e))
 
-            self.progress.SetValue(idx + 1)
-            self.Refresh()
-            self.Update()
+        def log(message):
+            print(message)
+            self.status_channel.log(message)
 
-        return processed
+        # 실패는 failures에 모아 두었다가 끝난 뒤 한 번에 알림 (처리는 멈추지 않음), 처리 통계는 저장 폴더에 기록
+        return process_images(input_paths, output_folder, max_width, min_quality, max_size_kb, output_format, mode,
+                              jobs, self.stop_event, log, self.status_channel.progress, None, effort, incremental,
+                              cache_dir, self.settings["encode_cache_mb"], stats, recursive, copy_strategy=copy_strategy,
+                              failures=failures, report_file=os.path.join(output_folder, BATCH_REPORT_FILE),
+                              memory_budget_mb=self.settings["memory_budget_mb"])
 
     def start_processing_thread(self, event):
-        threading.Thread(target=self.start_processing).start()
+        """설정은 UI 스레드에서 읽어 확인하고, 이미지 처리만 작업 스레드에서 실행합니다."""
+        job = self.start_processing()
+        if job is None:
+            return
+        self.status_channel.start()
+        threading.Thread(target=self.run_processing, args=(job,)).start()
 
     def start_processing(self):
+        """입력/출력 경로와 설정 값을 확인하여 처리 작업(dict)을 만듭니다. (잘못된 값이면 알리고 None)"""
         # ✅ 줄 단위로 분리
-        input_paths = [self.input_listctrl.GetItemText(i, 2) for i in range(self.input_listctrl.GetItemCount())]
+        input_paths = list(self.input_listctrl.paths)
         if not input_paths:
             wx.MessageBox("입력 경로 리스트가 비었습니다.", "알림", wx.ICON_INFORMATION)
-            return
+            return None
 
-        self.stop_requested = False
+        try:
+            width = int(self.width_entry.GetValue())
+            size_kb = int(self.size_entry.GetValue())
+            quality = int(self.quality_entry.GetValue())
+            jobs = int(self.jobs_entry.GetValue())
+            effort = self.get_selected_effort()
+            copy_strategy = self.get_selected_copy_strategy()
+            mode = self.get_selected_mode()
+        except ValueError:
+            wx.MessageBox("숫자(정수)를 정확히 입력하세요!", "오류", wx.ICON_ERROR)
+            return None
+
+        self.stop_event.clear()
         self.process_button.SetLabel("⏹ 중지")
 
         output_path = self.output_path_text.GetValue()
@@ -1563,20 +1704,7 @@ class ImageResizerFrame(wx.Frame):
 
             self.output_path_text.SetValue(output_path)
 
-        if self.clear_folder_checkbox.IsChecked():
-            output_path = self.output_path_text.GetValue()
-            clear_folder(output_path)
-
-        format_name = self.format_menu.GetValue()
-
-        try:
-            width = int(self.width_entry.GetValue())
-            size_kb = int(self.size_entry.GetValue())
-            quality = int(self.quality_entry.GetValue())
-            mode = self.get_selected_mode()
-        except ValueError:
-            wx.MessageBox("숫자(정수)를 정확히 입력하세요!", "오류", wx.ICON_ERROR)
-            return
+        incremental = self.incremental_checkbox.IsChecked()
 
         #self.stop_button.Enable()
         #self.process_button.Disable()
@@ -1585,39 +1713,84 @@ class ImageResizerFrame(wx.Frame):
         #self.log_status("처리 중입니다...")
         self.progress.SetValue(0)
 
-        count = self.process_images(input_paths, output_path, width, quality, size_kb, format_name, mode)
+        encode_cache = self.cache_checkbox.IsChecked()
+        return dict(
+            input_paths=input_paths, output_folder=output_path, max_width=width, min_quality=quality, max_size_kb=size_kb,
+            output_format=self.format_menu.GetValue(), mode=mode, jobs=jobs, effort=effort, incremental=incremental,
+            cache_dir=self.settings["encode_cache_dir"] if encode_cache else None, stats={},
+            recursive=self.recursive_checkbox.IsChecked(), copy_strategy=copy_strategy, failures=FailureReport(),
+            clear_output=self.clear_folder_checkbox.IsChecked() and not incremental,
+        )
+
+    def run_processing(self, job):
+        """작업 스레드: 이미지를 처리한 뒤 마무리는 UI 스레드(finish_processing)에 넘깁니다."""
+        count = 0
+        try:
+            count = self.process_images(**job)
+        finally:
+            wx.CallAfter(self.finish_processing, job, count)
+
+    def finish_processing(self, job, count):
+        self.status_channel.stop()  # 남은 로그/진행 상황 반영
+        stats = job["stats"]
+        encode_cache = job["cache_dir"] is not None
 
-        if self.stop_requested:
+        if self.stop_event.is_set():
             self.log_status("🚫 처리 중지됨")
             self.progress.SetValue(0)
 
         #self.stop_button.Disable()  # 혹은 Enable/Disable 로 제어
         #self.process_button.Enable()
 
-        if not self.stop_requested:
-            self.log_status(f"{count}개의 이미지 처리 완료")
+        if not self.stop_event.is_set():
+            cache_info = f" (캐시 적중 {stats.get('cache_hits', 0)}, 미적중 {stats.get('cache_misses', 0)})" if encode_cache else ""
+            self.log_status(f"{count}개의 이미지 처리 완료{cache_info}")
 
             # 출력폴더 열기
             if count > 0:
-                wx.CallAfter(Toast, None, f"{count}개의 이미지가 처리되었습니다!", 1000)
-                self.open_output_folder(output_path)
+                Toast(None, f"{count}개의 이미지가 처리되었습니다!", 1000)
+                self.open_output_folder(job["output_folder"])
             else:
                 wx.MessageBox("0개의 이미지가 처리되었습니다!", "완료", wx.ICON_INFORMATION)
         else:
-            self.stop_requested = False  # 처리 끝나고 초기화
+            self.stop_event.clear()  # 처리 끝나고 초기화
             wx.MessageBox("이미지 처리가 중지되었습니다.", "중지", wx.ICON_INFORMATION)
 
+        if job["failures"]:
+            self.report_failures(job["failures"], os.path.join(job["output_folder"], FAILURE_REPORT_FILE), "처리하지 못한 파일")
+
         self.process_button.SetLabel("▶ 이미지 처리 시작")
 
         # 설정 저장
-        self.settings["max_width"] = width
-        self.settings["max_size_kb"] = size_kb
-        self.settings["min_quality"] = quality
-        self.settings["output_format"] = format_name
+        self.settings["max_width"] = job["max_width"]
+        self.settings["max_size_kb"] = job["max_size_kb"]
+        self.settings["min_quality"] = job["min_quality"]
+        self.settings["output_format"] = job["output_format"]
         self.settings["clear_folder"] = self.clear_folder_checkbox.IsChecked()
-        self.settings["mode"] = mode
+        self.settings["incremental"] = job["incremental"]
+        self.settings["recursive"] = job["recursive"]
+        self.settings["encode_cache"] = encode_cache
+        self.settings["mode"] = job["mode"]
+        self.settings["jobs"] = job["jobs"]
+        self.settings["effort"] = job["effort"]
+        self.settings["copy_strategy"] = job["copy_strategy"]
         self.save_settings()
 
+    def report_failures(self, failures, report_path, title, show_dialog=True):
+        """실패 목록을 report_path.json/.csv로 저장하고 로그에 요약합니다. show_dialog이면 요약 창을 한 번 띄웁니다."""
+        saved = []
+        for ext in (".json", ".csv"):
+            try:
+                failures.save(report_path + ext)
+                saved.append(report_path + ext)
+            except OSError as e:
+                self.log_status(f"❌ 실패 목록 저장 실패: {report_path + ext} - {e}")
+
+        saved_info = f"실패 목록: {', '.join(saved)}" if saved else ""
+        self.log_status(f"⚠️ {title} {len(failures)}개 {saved_info}")
+        if show_dialog:
+            wx.MessageBox(f"{title} {len(failures)}개\n\n{failures.summary()}\n\n{saved_info}", "실패 목록", wx.ICON_WARNING)
+
     def open_output_folder(self, output_path):
         self.cleanup_explorer()
         # 탐색기에서 이미 해당 폴더가 열려있는지 확인하는 방식은 제한적이지만
@@ -1627,9 +1800,9 @@ class ImageResizerFrame(wx.Frame):
     def load_settings(self):
         if os.path.exists(SETTINGS_FILE):
             with open(SETTINGS_FILE, "r") as f:
-                return json.load(f)
+                return {**DEFAULT_SETTINGS, **json.load(f)}  # 새로 추가된 설정 항목은 기본값 사용
         else:
-            return DEFAULT_SETTINGS
+            return dict(DEFAULT_SETTINGS)
 
     def save_settings(self):
         with open(SETTINGS_FILE, "w") as f:
@@ -1639,20 +1812,16 @@ class ImageResizerFrame(wx.Frame):
         item_index = event.GetIndex()
         if item_index != wx.NOT_FOUND:
             # 전체 파일 목록을 가져오기
-            self.input_paths = [self.input_listctrl.GetItemText(i, 2) for i in range(self.input_listctrl.GetItemCount())]
+            self.input_paths = list(self.input_listctrl.paths)
 
             try:
                 self.open_image_viewer(item_index)
             except Exception as e:
                 e_ = f"{e}".replace("\\\\", "\\")
-                path = self.input_listctrl.GetItemText(item_index, 2)
+                path = self.input_listctrl.path(item_index)
                 print(f"❌ 파일 열기 실패: {path} - {e_}")
                 wx.MessageBox(f"❌ 파일 열기 실패: {os.path.basename(path)}", "오류", wx.ICON_ERROR)
 
-    def update_numbering(self):
-        for idx in range(self.input_listctrl.GetItemCount()):
-            self.input_listctrl.SetItem(idx, 0, str(idx + 1))  # No. 열은 0번
-
     def open_image_viewer(self, start_index=0):
         splash_bitmap = wx.Image("./data/splash.jpg").ConvertToBitmap()
         # 스플래시 설정 (timeout=0이면 수동으로 닫음)
@@ -1680,17 +1849,12 @@ class ImageResizerFrame(wx.Frame):
         if path in self.input_paths:
             self.input_paths.remove(path)
 
-        # 리스트컨트롤에서 삭제 (1번 열: 파일 경로 기준)
-        for idx in range(self.input_listctrl.GetItemCount()):
-            item_path = self.input_listctrl.GetItemText(idx, 2)
-            if item_path == path:
-                self.input_listctrl.DeleteItem(idx)
-                format_name = self.input_listctrl.GetItemText(idx, 1)
-                self.undo_stack.append([(idx, format_name, path)])
-                break
-
-        # 🔢 No. 열 다시 채우기
-        self.update_numbering()
+        # 리스트컨트롤에서 삭제 (파일 경로 기준, 번호 열은 자동으로 다시 매겨짐)
+        if path in self.input_listctrl.paths:
+            idx = self.input_listctrl.paths.index(path)
+            self.undo_stack.append(self.input_listctrl.delete_items([idx]))
+            self.input_path_keys.discard(normalize_path(path))
+
         self.update_input_path_label()
 
         #### 썸네일self.update_list_thumbnails()
@@ -1699,16 +1863,8 @@ class ImageResizerFrame(wx.Frame):
         deleted = self.undo_stack.pop()
         format_name = deleted[0][1]
 
-        # 리스트에 삽입
-        self.input_listctrl.InsertItem(index, str(index + 1))  # No.
-        self.input_listctrl.SetItem(index, 1, format_name)  # 형식
-        self.input_listctrl.SetItem(index, 2, path)  # 경로
-
-        # 전체 항목 No. 다시 정렬
-        for i in range(self.input_listctrl.GetItemCount()):
-            self.input_listctrl.SetItem(i, 0, str(i + 1))
-
-        self.update_input_path_label()
+        # 리스트에 삽입 (No. 열은 자동으로 다시 매겨짐)
+        self.restore_rows([(index, format_name, path)])
 
         # 썸네일도 업데이트
         #### 썸네일 self.update_list_thumbnails()
@@ -1759,5 +1915,6 @@ class ImageResizerApp(wx.App):
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # PyInstaller 실행 파일에서 프로세스 풀 사용
     app = ImageResizerApp(False)
     app.MainLoop()
@@ -0,0 +1,121 @@
+# K-ImageResizer 명령줄 실행 (GUI 없이 일괄 처리)
+#
+# 사용 예:
+#   python resizer_cli.py 사진폴더 a.jpg -o 출력 -w 1024 -s 300 -f WebP -m size -j 8
+import os
+import sys
+import argparse
+import multiprocessing
+
+from version import __version__
+from resizer_core import (COPY_STRATEGIES, DEFAULT_CACHE_MB, DEFAULT_COPY_STRATEGY, DEFAULT_EFFORT, EFFORT_CHOICES,
+                          KEEP_FORMAT, FailureReport, clear_folder, default_cache_dir, physical_core_count,
+                          process_images)
+
+
+# 명령줄에서 받는 출력 형식 (keep = 원본 유지)
+FORMAT_CHOICES = {
+    "jpeg": "JPEG",
+    "jpg": "JPEG",
+    "png": "PNG",
+    "webp": "WebP",
+    "avif": "AVIF",
+    "tiff": "TIFF",
+    "bmp": "BMP",
+    "keep": KEEP_FORMAT,
+}
+
+MODE_CHOICES = {"quality": 1, "size": 0}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="k-imageresizer",
+        description="이미지 크기(해상도)를 축소하고 압축하여 저장합니다.",
+    )
+    parser.add_argument("inputs", nargs="+", help="입력 이미지 파일 또는 폴더")
+    parser.add_argument("-o", "--output", help="출력 폴더 (기본값: 첫 번째 입력이 있는 폴더 아래의 '출력')")
+    parser.add_argument("-w", "--max-width", type=int, default=1024, help="최대 너비(px) (기본값: 1024)")
+    parser.add_argument("-s", "--max-kb", type=int, default=300, help="최대 용량(KB), 용량 우선 모드에서 사용 (기본값: 300)")
+    parser.add_argument("-q", "--quality", type=int, default=85, help="화질(1~100), 화질 우선 모드에서 사용 (기본값: 85)")
+    parser.add_argument("-f", "--format", type=str.lower, choices=FORMAT_CHOICES, default="jpeg",
+                        help="출력 형식 (keep: 원본 유지, 기본값: jpeg)")
+    parser.add_argument("-m", "--mode", choices=MODE_CHOICES, default="quality",
+                        help="압축 모드: quality(화질 우선) 또는 size(용량 우선) (기본값: quality)")
+    parser.add_argument("-e", "--effort", choices=EFFORT_CHOICES, default=DEFAULT_EFFORT,
+                        help=f"WebP/AVIF 인코딩 노력: fast, balanced, best (기본값: {DEFAULT_EFFORT})")
+    parser.add_argument("--copy-mode", choices=COPY_STRATEGIES, default=DEFAULT_COPY_STRATEGY,
+                        help="기준 이하라 원본 그대로 저장하는 이미지의 저장 방식: copy(복사), reflink(블록 공유 복제), "
+                             f"hardlink(하드 링크) - 지원하지 않으면 복사 (기본값: {DEFAULT_COPY_STRATEGY})")
+    parser.add_argument("-j", "--jobs", type=int, default=physical_core_count(),
+                        help="병렬 작업 수 (기본값: 물리 코어 수)")
+    parser.add_argument("--memory-mb", type=int,
+                        help="병렬 처리 메모리 한도(MB): 동시에 처리하는 이미지의 예상 메모리 합계를 이 값 이하로 유지하며, "
+                             "한도보다 큰 이미지는 혼자 처리 (기본값: 사용 가능한 메모리의 절반, 0: 제한 없음)")
+    parser.add_argument("-r", "--recursive", action="store_true",
+                        help="하위 폴더까지 탐색하고, 출력 폴더에 같은 폴더 구조로 저장")
+    parser.add_argument("-n", "--dry-run", action="store_true",
+                        help="처리 계획(원본 복사/인코딩/열 수 없음)과 예상 시간만 출력하고 처리하지 않음")
+    parser.add_argument("--clear", action="store_true", help="저장 폴더를 비우고 시작 (--incremental과 함께 쓰면 무시)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="원본과 설정이 지난 실행 때와 같은 이미지는 건너뜀 (저장 폴더의 처리 기록 사용)")
+    parser.add_argument("--cache", action="store_true", help="인코딩 캐시 사용 (같은 원본/설정의 이전 결과 재사용)")
+    parser.add_argument("--cache-dir", default=default_cache_dir(), help="인코딩 캐시 폴더")
+    parser.add_argument("--cache-mb", type=int, default=DEFAULT_CACHE_MB,
+                        help=f"인코딩 캐시 최대 용량(MB) (기본값: {DEFAULT_CACHE_MB})")
+    parser.add_argument("--report", help="실패한 파일 목록을 저장할 파일 (.csv면 CSV, 그 외에는 JSON)")
+    parser.add_argument("--stats", help="처리 통계(처리량, 단계별 시간 p50/p95, 입출력 용량, 인코딩 횟수)를 저장할 JSON 파일")
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    return parser
+
+
+def default_output_folder(first_input):
+    if os.path.isfile(first_input):
+        base_folder = os.path.dirname(first_input)
+    elif os.path.isdir(first_input):
+        base_folder = first_input
+    else:
+        base_folder = os.getcwd()
+    return os.path.join(base_folder, "출력")
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    output_folder = args.output or default_output_folder(args.inputs[0])
+    os.makedirs(output_folder, exist_ok=True)
+    failures = FailureReport()
+    if args.clear and not args.incremental and not args.dry_run:
+        clear_folder(output_folder, on_error=lambda file_path, e: failures.add(file_path, "clear", e))
+
+    stats = {}
+    stop_event = multiprocessing.Event()
+    try:
+        count = process_images(args.inputs, output_folder, args.max_width, args.quality, args.max_kb,
+                               FORMAT_CHOICES[args.format], MODE_CHOICES[args.mode], max(1, args.jobs),
+                               stop_event, effort=args.effort, incremental=args.incremental,
+                               cache_dir=args.cache_dir if args.cache else None, cache_max_mb=args.cache_mb, stats=stats,
+                               recursive=args.recursive, dry_run=args.dry_run,
+                               copy_strategy=args.copy_mode, failures=failures, report_file=args.stats,
+                               memory_budget_mb=args.memory_mb)
+    except KeyboardInterrupt:
+        stop_event.set()
+        print("🚫 처리 중지됨")
+        return 130
+
+    if args.dry_run:
+        return 0
+
+    cache_info = f" (캐시 적중 {stats['cache_hits']}, 미적중 {stats['cache_misses']})" if args.cache else ""
+    print(f"{count}개의 이미지 처리 완료{cache_info}")
+    if failures:
+        print(f"⚠️ 실패 {len(failures)}개:\n{failures.summary()}", file=sys.stderr)
+        if args.report:
+            failures.save(args.report)
+            print(f"실패 목록 저장: {args.report}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
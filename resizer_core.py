@@ -0,0 +1,1402 @@
+# K-ImageResizer 핵심 처리 모듈 (GUI 비의존)
+# wx 없이도 리사이즈/압축/일괄 처리를 할 수 있도록 GUI와 분리되어 있습니다.
+import io
+import csv
+import json
+import hashlib
+import math
+import os
+import queue
+import shutil
+import threading
+import time
+import ctypes
+import ctypes.util
+from collections import deque, namedtuple
+from contextlib import contextmanager
+from functools import partial
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from PIL import Image as PILImage, ImageFile
+ImageFile.LOAD_TRUNCATED_IMAGES = True
+
+try:
+    import psutil
+except ImportError:  # psutil은 선택 사항 (물리 코어 수, 사용 가능한 메모리 확인용)
+    psutil = None
+
+try:
+    import fcntl
+except ImportError:  # Windows (reflink 복제 없이 일반 복사)
+    fcntl = None
+
+
+# 입력으로 받는 이미지 확장자
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.tiff', '.webp', '.bmp', '.avif', '.gif', '.ico')
+
+# 확장자가 없는 파일의 이미지 판별용 시그니처 (JPEG, PNG, GIF, BMP, TIFF, ICO; WebP/AVIF는 따로 확인)
+IMAGE_SIGNATURES = (b"\xff\xd8\xff", b"\x89PNG\r\n\x1a\n", b"GIF87a", b"GIF89a", b"BM", b"II*\x00", b"MM\x00*",
+                    b"\x00\x00\x01\x00")
+
+# 출력 형식 '원본 유지' (입력 파일의 형식을 그대로 사용)
+KEEP_FORMAT = '원본 유지'
+
+# 증분 처리: 출력 폴더에 저장하는 처리 기록(매니페스트) 파일 이름
+MANIFEST_FILE = ".k-imageresizer-manifest.json"
+
+# 실패 목록: 출력 폴더에 이 이름의 .json/.csv로 저장 (단계 이름은 STAGE_LABELS 참고)
+FAILURE_REPORT_FILE = ".k-imageresizer-failures"
+Failure = namedtuple("Failure", "path stage error_type message")
+STAGE_LABELS = {
+    "open": "열기", "clear": "폴더 비우기", "copy": "원본 복사", "cache": "캐시", "decode": "디코딩/리사이즈",
+    "encode": "압축", "save": "저장", "thumbnail": "썸네일", "view": "이미지 표시", "worker": "작업 프로세스",
+}
+
+# 인코딩 캐시: 원본 내용 해시 + 설정이 같으면 이전 인코딩 결과를 재사용
+# (인코딩 방식이 바뀌어 결과가 달라지면 ENCODE_CACHE_VERSION을 올려 기존 캐시를 무효화)
+ENCODE_CACHE_VERSION = 1
+DEFAULT_CACHE_MB = 1024
+
+# EXIF를 헤더에서 읽을 수 있는 형식 (그 외 형식은 info에 exif가 있을 때만 읽음,
+# 예: eXIf 청크가 없는 PNG의 getexif()는 픽셀 전체를 디코딩함)
+HEADER_EXIF_FORMATS = ("JPEG", "MPO", "TIFF", "WEBP")
+
+# 헤더만 읽어 얻는 이미지 정보 (width/height는 EXIF 회전 보정 후 크기, format은 파일 내용 기준 형식)
+ImageInfo = namedtuple("ImageInfo", "width height format orientation mode file_size")
+
+# probe_image 결과 캐시: 경로 → ((파일 크기, 수정 시각), ImageInfo)
+_probe_cache = {}
+
+# 처리 통계: 이미지마다 단계별 시간을 재서 배치가 끝나면 요약 (출력 폴더에 이 이름의 JSON으로도 저장)
+BATCH_REPORT_FILE = ".k-imageresizer-report.json"
+TIMING_LABELS = {
+    "open": "열기", "decode": "디코딩", "resize": "리사이즈", "transpose": "회전 보정", "convert": "모드 변환",
+    "probe_small": "축소본 시험 인코딩", "probe": "시험 인코딩", "encode": "인코딩", "write": "쓰기",
+    "copy": "원본 복사", "cache": "캐시",
+}
+
+# 처리 계획 항목: action은 'copy'(원본 복사), 'encode'(리사이즈+인코딩), 'unsupported'(열 수 없음, error에 예외)
+PlanItem = namedtuple("PlanItem", "input_file output_folder action info error")
+
+# 작업량 예상용: 출력 1메가픽셀을 한 번 인코딩하는 데 걸리는 대략적인 시간(초)
+ENCODE_SECONDS_PER_MP = {"JPEG": 0.02, "PNG": 1.6, "TIFF": 0.01, "BMP": 0.01}
+WEBP_SECONDS_PER_MP = {"fast": 0.06, "balanced": 0.2, "best": 0.26}
+AVIF_SECONDS_PER_MP = {"fast": 0.3, "balanced": 3.8, "best": 30.0}
+DECODE_SECONDS_PER_MP = 0.01   # 원본 1메가픽셀 디코딩 (JPEG은 축소 배율 디코딩 반영)
+ESTIMATE_SEARCH_ENCODES = 3    # 용량 우선 모드에서 장당 평균 시험 인코딩 횟수
+
+# 메모리 한도: 병렬 처리 중인 이미지들의 예상 메모리 합계가 한도를 넘지 않게 작업을 넣음
+# (디코딩한 원본 1픽셀의 바이트 수는 Pillow 내부 형식 기준, RGB도 4바이트)
+PIXEL_BYTES = {"1": 1, "L": 1, "P": 1, "I;16": 2}
+PIXEL_MEMORY_FACTOR = 2.25         # 원본 외에 디코더 버퍼, 리사이즈 중간 결과, 모드 변환 복사본까지 포함한 배율 (투명 PNG 측정 기준)
+DEFAULT_MEMORY_BUDGET_MB = 2048    # 사용 가능한 메모리를 확인할 수 없을 때의 한도
+M_MMAP_THRESHOLD = -3              # glibc mallopt: 이 크기 이상의 할당은 mmap으로 (해제 즉시 운영체제에 반환)
+WORKER_MMAP_THRESHOLD = 1024 * 1024
+
+# 프로세스 풀 작업자에서 참조하는 중지 이벤트 (작업자 초기화 시 설정)
+_worker_stop_event = None
+
+# JPEG 입력은 DCT 단계에서 1/2, 1/4, 1/8 배율로 줄여서 디코딩 (벤치마크 비교용으로 끌 수 있음)
+USE_JPEG_DRAFT = True
+
+# EXIF 방향 태그 (5~8은 90도 회전되어 저장된 사진)
+EXIF_ORIENTATION = 0x0112
+ROTATED_ORIENTATIONS = (5, 6, 7, 8)
+
+# EXIF 방향 값 → 회전 보정에 사용할 변환
+ORIENTATION_TRANSPOSE = {
+    2: PILImage.Transpose.FLIP_LEFT_RIGHT,
+    3: PILImage.Transpose.ROTATE_180,
+    4: PILImage.Transpose.FLIP_TOP_BOTTOM,
+    5: PILImage.Transpose.TRANSPOSE,
+    6: PILImage.Transpose.ROTATE_270,
+    7: PILImage.Transpose.TRANSVERSE,
+    8: PILImage.Transpose.ROTATE_90,
+}
+
+# 출력 형식별로 인코더에 그대로 넘기는 모드 (그 외 모드만 변환하며, 알파 채널은 가능하면 RGBA로 유지)
+ENCODER_MODES = {
+    "JPEG": ("RGB", "L"),
+    "PNG": ("RGB", "RGBA", "L", "LA", "P", "1"),
+    "WebP": ("RGB", "RGBA"),
+    "AVIF": ("RGB", "RGBA"),
+    "TIFF": ("RGB", "RGBA", "L", "LA", "P", "1"),
+    "BMP": ("RGB", "L", "P", "1"),
+}
+ALPHA_MODES = ("RGBA", "LA", "PA", "RGBa", "La")
+GRAYSCALE_MODES = ("1", "L", "LA", "La", "I", "I;16", "F")
+RESIZE_MODES = ("RGB", "RGBA", "L", "LA", "CMYK")  # LANCZOS로 바로 줄일 수 있는 모드
+
+# 원본 복사 방식: copy(일반 복사), reflink(블록을 공유하는 복제, Btrfs/XFS 등),
+# hardlink(하드 링크, 같은 드라이브만) - 지원하지 않으면 일반 복사로 대신함
+COPY_STRATEGIES = ("copy", "reflink", "hardlink")
+DEFAULT_COPY_STRATEGY = "copy"
+COPY_METHOD_LABELS = {"copy": "원본 복사", "reflink": "원본 복제", "hardlink": "원본 링크"}
+FICLONE = 0x40049409  # Linux ioctl: 파일 전체를 reflink로 복제
+
+# 인코딩 노력 단계 (WebP/AVIF): fast(빠름), balanced(균형), best(최고 압축률, 가장 느림)
+EFFORT_CHOICES = ("fast", "balanced", "best")
+DEFAULT_EFFORT = "best"
+AVIF_SPEED = {"fast": 8, "balanced": 5, "best": 0}   # 0(느림, 고효율) ~ 10(빠름)
+WEBP_METHOD = {"fast": 2, "balanced": 4, "best": 6}  # 0(빠름) ~ 6(느림, 고효율)
+
+# 용량 우선 탐색 중의 시험 인코딩은 노력 단계와 관계없이 빠른 설정으로 수행
+AVIF_PROBE_SPEED = AVIF_SPEED["fast"]
+WEBP_PROBE_METHOD = WEBP_METHOD["fast"]
+
+# 용량 우선 탐색의 quality 예측 설정
+PREDICT_FORMATS = {"JPEG": True, "WebP": True, "AVIF": True}  # 형식별 예측 사용 여부 (False이면 이진 탐색)
+PREDICT_MIN_SIZE = 256          # 가로/세로 중 짧은 쪽이 이보다 작으면 예측 없이 이진 탐색
+PREDICT_REDUCE_FACTOR = 4       # 시험 인코딩용 축소 배율 (픽셀 수 1/16)
+PREDICT_SMALL_STEP = 10         # 축소본을 인코딩하는 quality 간격 (사이 값은 로그 용량으로 보간, 최대 10회)
+PREDICT_DEFAULT_RATIO = 0.5     # 원본을 인코딩하기 전의 '원본/축소본 용량 비율 ÷ 픽셀 수 비율'
+PREDICT_MAX_PROBES = 4          # 예측으로 원본을 인코딩하는 최대 횟수 (이후 이진 탐색)
+PREDICT_TOLERANCE = 1           # 예측 탐색에서 허용하는 quality 오차 (확인 안 된 값이 이만큼 남으면 종료)
+
+
+def physical_core_count():
+    """물리 코어 수를 반환합니다. (확인할 수 없으면 논리 코어 수)"""
+    cores = psutil.cpu_count(logical=False) if psutil else None
+    return cores or os.cpu_count() or 1
+
+def default_memory_budget_mb():
+    """병렬 처리 메모리 한도의 기본값(MB): 사용 가능한 메모리의 절반 (확인할 수 없으면 DEFAULT_MEMORY_BUDGET_MB)"""
+    if psutil is not None:
+        return max(256, psutil.virtual_memory().available // (2 * 1024 * 1024))
+    try:  # Linux
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return max(256, int(line.split()[1]) // (2 * 1024))
+    except (OSError, ValueError):
+        pass
+    return DEFAULT_MEMORY_BUDGET_MB
+
+def clear_folder(folder_path, on_error=None):
+    """지정한 폴더 내의 파일을 모두 삭제합니다. 삭제 실패 시 on_error(파일 경로, 예외)를 호출합니다."""
+    if not os.path.isdir(folder_path):
+        print("폴더가 존재하지 않습니다.")
+        return
+
+    for filename in os.listdir(folder_path):
+        file_path = os.path.join(folder_path, filename)
+        if os.path.isfile(file_path):
+            try:
+                os.remove(file_path)
+            except Exception as e:
+                e_ = f"{e}".replace("\\\\", "\\")
+                print(f"❌ 파일 삭제 실패: {file_path} - {e_}")
+                if on_error:
+                    on_error(file_path, e)
+
+def normalize_path(path):
+    """같은 파일을 가리키는 경로가 같은 값이 되도록 정규화합니다. (심볼릭 링크 해석, 대소문자/구분자 통일)"""
+    return os.path.normcase(os.path.realpath(path))
+
+def is_image_file(path):
+    """확장자로 이미지 파일 여부를 판단합니다. 확장자가 없는 파일은 앞부분(매직 바이트)을 읽어 판단합니다."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext:
+        return ext in IMAGE_EXTENSIONS
+    try:
+        with open(path, "rb") as f:
+            head = f.read(16)
+    except OSError:
+        return False
+    return (head.startswith(IMAGE_SIGNATURES)
+            or (head[:4] == b"RIFF" and head[8:12] == b"WEBP")
+            or head[4:12] in (b"ftypavif", b"ftypavis"))
+
+def walk_image_files(folder, recursive=False, exclude=()):
+    """폴더의 이미지 파일 경로를 os.scandir로 하나씩 내보냅니다. (목록 전체를 만들지 않음)
+
+    recursive이면 하위 폴더까지 탐색하며, exclude에 있는 폴더(출력 폴더 등)는 건너뜁니다.
+    """
+    excluded = {os.path.normcase(os.path.abspath(p)) for p in exclude}
+    folders = [folder]
+    while folders:
+        current = folders.pop()
+        try:
+            entries = os.scandir(current)
+        except OSError:
+            continue
+        subfolders = []
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive and os.path.normcase(os.path.abspath(entry.path)) not in excluded:
+                            subfolders.append(entry.path)
+                    elif entry.is_file() and is_image_file(entry.path):
+                        yield entry.path
+                except OSError:
+                    continue
+        folders.extend(reversed(subfolders))
+
+def scan_image_files(input_paths, recursive=False, exclude=()):
+    """입력 경로(파일 또는 폴더) 목록을 (이미지 파일, 상대 하위 폴더) 형태로 하나씩 내보냅니다.
+
+    recursive이면 하위 폴더까지 탐색하고, 상대 하위 폴더로 원본 폴더 구조를 출력 폴더에 재현할 수 있게 합니다.
+    (폴더 입력은 그 폴더 기준, 파일 입력은 파일들의 공통 상위 폴더 기준)
+    """
+    base_folder = None
+    if recursive:
+        file_folders = [os.path.dirname(os.path.abspath(p)) for p in input_paths if os.path.isfile(p)]
+        try:
+            base_folder = os.path.commonpath(file_folders) if file_folders else None
+        except ValueError:  # 서로 다른 드라이브
+            base_folder = None
+
+    for input_path in input_paths:
+        if os.path.isfile(input_path):
+            relative = os.path.relpath(os.path.dirname(os.path.abspath(input_path)), base_folder) if base_folder else ""
+            yield input_path, ("" if relative == os.curdir else relative)
+        elif os.path.isdir(input_path):
+            for path in walk_image_files(input_path, recursive, exclude):
+                relative = os.path.relpath(os.path.dirname(path), input_path) if recursive else ""
+                yield path, ("" if relative == os.curdir else relative)
+
+def iter_in_background(iterable, counter):
+    """iterable을 별도 스레드에서 읽어 넘겨 주는 제너레이터입니다. (폴더 탐색과 이미지 처리를 동시에 진행)
+
+    counter['total']에는 지금까지 읽은 항목 수를 기록합니다. 소비를 멈추면 탐색 스레드도 멈춥니다.
+    """
+    items = queue.Queue()
+    finished = object()
+    abandoned = threading.Event()
+    errors = []
+
+    def produce():
+        try:
+            for item in iterable:
+                if abandoned.is_set():
+                    return
+                counter['total'] += 1
+                items.put(item)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            items.put(finished)
+
+    counter['total'] = 0
+    threading.Thread(target=produce, daemon=True).start()
+    try:
+        while True:
+            item = items.get()
+            if item is finished:
+                break
+            yield item
+    finally:
+        abandoned.set()
+    if errors:
+        raise errors[0]
+
+def normalize_extension(output_path, format_name):
+    if format_name.lower() in ["jpeg", "jpg"]:
+        base, _ = os.path.splitext(output_path)
+        return base + ".jpg"
+    return output_path
+
+def header_orientation(img):
+    """EXIF 방향 값을 픽셀 디코딩 없이 헤더에서 읽습니다. (없으면 1)"""
+    if img.format in HEADER_EXIF_FORMATS or "exif" in img.info:
+        return img.getexif().get(EXIF_ORIENTATION, 1)
+    return 1
+
+def displayed_size(img):
+    """회전 보정(exif_transpose) 후의 (너비, 높이)를 픽셀 디코딩 없이 헤더 정보로 계산합니다."""
+    if header_orientation(img) in ROTATED_ORIENTATIONS:
+        return img.height, img.width
+    return img.size
+
+def probe_image(path):
+    """헤더만 읽어 ImageInfo를 반환합니다. (픽셀은 디코딩하지 않으며, 파일이 그대로면 이전 결과를 재사용)"""
+    stat = os.stat(path)
+    signature = (stat.st_size, stat.st_mtime_ns)
+    cached = _probe_cache.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    with PILImage.open(path) as img:
+        width, height = displayed_size(img)
+        info = ImageInfo(width, height, img.format, header_orientation(img), img.mode, stat.st_size)
+    _probe_cache[path] = (signature, info)
+    return info
+
+def plan_images(image_files, max_width, max_size_kb, output_format):
+    """(입력 파일, 출력 폴더)마다 헤더 정보만으로 처리 방법을 정해 PlanItem을 차례로 내보냅니다. (픽셀 디코딩 없음)"""
+    for input_file, output_folder in image_files:
+        try:
+            info = probe_image(input_file)
+        except Exception as e:
+            yield PlanItem(input_file, output_folder, 'unsupported', None, e)
+            continue
+
+        output_ext, _ = output_format_for(input_file, output_format, info.format)
+        if is_copy_through(input_file, output_ext, info.width, info.file_size, max_width, max_size_kb):
+            yield PlanItem(input_file, output_folder, 'copy', info, None)
+        else:
+            yield PlanItem(input_file, output_folder, 'encode', info, None)
+
+def draft_scale(info, max_width):
+    """draft_for_width가 적용할 JPEG 축소 배율 (1, 2, 4, 8)"""
+    scale = 1
+    if USE_JPEG_DRAFT and info.format == "JPEG":
+        while scale < 8 and info.width / (scale * 2) >= max_width:
+            scale *= 2
+    return scale
+
+def estimate_image_memory(info, max_width):
+    """이미지 한 장을 처리하는 동안 필요한 대략적인 메모리(바이트)를 헤더 정보로 계산합니다. (JPEG 축소 디코딩 반영)"""
+    scale = draft_scale(info, max_width)
+    pixels = info.width * info.height / (scale * scale)
+    return int(pixels * PIXEL_BYTES.get(info.mode, 4) * PIXEL_MEMORY_FACTOR)
+
+def encode_seconds_per_mp(format_name, mode, effort):
+    """출력 1메가픽셀을 처리하는 데 걸리는 예상 인코딩 시간(초) (용량 우선 모드의 시험 인코딩 포함)"""
+    if format_name == "WebP":
+        final, probe = WEBP_SECONDS_PER_MP[effort], WEBP_SECONDS_PER_MP["fast"]
+    elif format_name == "AVIF":
+        final, probe = AVIF_SECONDS_PER_MP[effort], AVIF_SECONDS_PER_MP["fast"]
+    else:
+        final = probe = ENCODE_SECONDS_PER_MP.get(format_name, ENCODE_SECONDS_PER_MP["BMP"])
+
+    if mode == 1 or format_name not in ("JPEG", "WebP", "AVIF"):
+        return final
+    if format_name == "JPEG":
+        return final * ESTIMATE_SEARCH_ENCODES
+    return probe * ESTIMATE_SEARCH_ENCODES + final
+
+def estimate_workload(plan, max_width, output_format, mode, effort=DEFAULT_EFFORT, jobs=1):
+    """처리 계획의 작업량과 예상 소요 시간을 계산합니다.
+
+    반환값: {'copy', 'encode', 'unsupported': 파일 수, 'copy_mb': 복사할 용량(MB),
+            'decode_mp', 'encode_mp': 디코딩/인코딩할 메가픽셀, 'seconds': 예상 시간(초, jobs개 병렬 기준)}
+    """
+    workload = dict(copy=0, encode=0, unsupported=0, copy_mb=0.0, decode_mp=0.0, encode_mp=0.0, seconds=0.0)
+    for item in plan:
+        workload[item.action] += 1
+        if item.action == 'copy':
+            workload['copy_mb'] += item.info.file_size / (1024 * 1024)
+        elif item.action == 'encode':
+            info = item.info
+            scale = draft_scale(info, max_width)
+            decode_mp = info.width * info.height / (scale * scale) / 1e6
+            output_width = min(info.width, max_width)
+            encode_mp = output_width * (info.height * output_width / info.width) / 1e6
+            _, format_name = output_format_for(item.input_file, output_format, info.format)
+            workload['decode_mp'] += decode_mp
+            workload['encode_mp'] += encode_mp
+            workload['seconds'] += decode_mp * DECODE_SECONDS_PER_MP + encode_mp * encode_seconds_per_mp(format_name, mode, effort)
+
+    workload['seconds'] /= max(1, min(jobs, workload['encode']))
+    return workload
+
+def format_duration(seconds):
+    """초를 '1시간 2분', '3분 20초', '5초' 형태로 표시합니다."""
+    seconds = round(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}시간 {seconds % 3600 // 60}분"
+    if seconds >= 60:
+        return f"{seconds // 60}분 {seconds % 60}초"
+    return f"{max(1, seconds)}초"
+
+def output_format_for(input_file, output_format, img_format=None):
+    """출력 형식 설정에 따른 (출력 확장자, 저장 형식)을 반환합니다. ('원본 유지'면 입력 파일의 형식)"""
+    if output_format == KEEP_FORMAT:
+        output_ext = (os.path.splitext(os.path.basename(input_file))[1].replace('.', '')
+                      or (img_format or '').lower().replace('jpeg', 'jpg'))
+        return output_ext, output_ext.upper().replace('JPG', 'JPEG').replace('WEBP', 'WebP')
+    return output_format.lower().replace('jpeg', 'jpg'), output_format
+
+def is_copy_through(input_file, output_ext, width, file_size, max_width, max_size_kb):
+    """원본 유지 조건: 입/출력 동일 형식 & 너비, 용량 모두 기준 이하"""
+    input_ext = os.path.splitext(os.path.basename(input_file))[1].replace('.', '').lower().replace('jpeg', 'jpg')
+    return input_ext == output_ext and width <= max_width and file_size <= max_size_kb * 1024
+
+def draft_for_width(img, max_width):
+    """JPEG을 회전 보정 후 너비가 max_width 이상인 가장 작은 2의 거듭제곱 배율로 디코딩하도록 설정합니다.
+
+    디코딩 전에 호출해야 하며, 이후 resize_image_keep_ratio가 LANCZOS로 정확한 크기로 마무리합니다.
+    """
+    if not USE_JPEG_DRAFT or img.format != "JPEG":
+        return
+    scale = max_width / displayed_size(img)[0]
+    if scale < 1:
+        img.draft(None, (math.ceil(img.width * scale), math.ceil(img.height * scale)))
+
+def has_alpha(img):
+    return img.mode in ALPHA_MODES or (img.mode in ("P", "L", "RGB") and "transparency" in img.info)
+
+def resize_image_keep_ratio(img, base_width, rotated=False):
+    """가로/세로 비율을 유지하며 너비를 base_width로 줄입니다.
+
+    rotated이면 회전 보정 후의 너비(저장된 높이) 기준으로 줄이므로, 회전 보정 전에 호출해 작은 이미지만 회전할 수 있습니다.
+    LANCZOS로 줄일 수 없는 모드(팔레트 등)는 줄여야 할 때만 RGB/RGBA/L로 변환합니다.
+    """
+    width, height = img.size[::-1] if rotated else img.size
+    if width <= base_width:
+        return img
+    w_percent = base_width / float(width)
+    h_size = int(float(height) * w_percent)
+    if img.mode not in RESIZE_MODES:
+        img = img.convert("RGBA" if has_alpha(img) else "L" if img.mode in GRAYSCALE_MODES else "RGB")
+    return img.resize((h_size, base_width) if rotated else (base_width, h_size), PILImage.LANCZOS)
+
+def apply_orientation(img, orientation):
+    """EXIF 방향 값에 따라 회전/뒤집기합니다. (보정이 필요 없으면 복사하지 않고 그대로 반환)"""
+    transpose = ORIENTATION_TRANSPOSE.get(orientation)
+    return img.transpose(transpose) if transpose is not None else img
+
+def convert_for_encoder(img, format_name):
+    """출력 형식의 인코더가 받을 수 있는 모드로 변환합니다. (이미 맞으면 그대로 반환)
+
+    알파 채널은 지원하는 형식(PNG/WebP/AVIF/TIFF)이면 RGBA로 유지하고, 흑백 이미지는 가능하면 L로 유지합니다.
+    """
+    modes = ENCODER_MODES.get(format_name, ("RGB",))
+    if img.mode not in ALPHA_MODES and has_alpha(img) and "RGBA" in modes and "P" not in modes:
+        return img.convert("RGBA")  # 투명색 지정(tRNS)을 저장하지 못하는 형식은 알파 채널로 변환
+    if img.mode in modes:
+        return img
+    if has_alpha(img) and "RGBA" in modes:
+        return img.convert("RGBA")
+    if img.mode in GRAYSCALE_MODES and "L" in modes:
+        return img.convert("L")
+    return img.convert("RGB")
+
+def encode_image(img, format_name, **params):
+    """이미지를 파일 대신 메모리 버퍼에 인코딩하여 bytes로 반환합니다."""
+    buffer = io.BytesIO()
+    img.save(buffer, format=format_name, **params)
+    return buffer.getvalue()
+
+def new_metrics():
+    """이미지 한 장의 처리 통계: 단계별 시간(초), 인코딩 횟수(원본 크기/축소본), 입/출력 용량(바이트), 입/출력 메가픽셀"""
+    return {"seconds": {}, "encodes": 0, "small_encodes": 0, "bytes_in": 0, "bytes_out": 0,
+            "megapixels_in": 0.0, "megapixels_out": 0.0}
+
+@contextmanager
+def timed(metrics, stage):
+    """with 블록의 실행 시간을 metrics["seconds"][stage]에 더합니다. (metrics가 None이면 재지 않음)"""
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = metrics["seconds"]
+        seconds[stage] = seconds.get(stage, 0.0) + time.perf_counter() - start
+
+def timed_encoder(encode, metrics, stage):
+    """인코딩 시간을 stage에 더하고 인코딩 횟수를 세는 encode 함수를 만듭니다. (metrics가 None이면 encode 그대로)
+
+    축소본 시험 인코딩('probe_small')은 원본 크기 인코딩과 따로 small_encodes에 셉니다.
+    """
+    if metrics is None:
+        return encode
+    counter = "small_encodes" if stage == "probe_small" else "encodes"
+
+    def encode_timed(*args, **params):
+        metrics[counter] += 1
+        with timed(metrics, stage):
+            return encode(*args, **params)
+    return encode_timed
+
+def encode_jpeg(img, quality):
+    try:
+        return encode_image(img, "JPEG", quality=quality, optimize=True)
+    except OSError:
+        return encode_image(img, "JPEG", quality=quality)
+
+def encode_png(img, compress_level=9):
+    try:
+        return encode_image(img, "PNG", compress_level=compress_level, optimize=True)
+    except OSError:
+        return encode_image(img, "PNG", compress_level=compress_level)
+
+def encode_webp(img, quality, method=6):
+    try:
+        return encode_image(img, "WebP", quality=quality, method=method)
+    except OSError:
+        return encode_image(img, "WebP", quality=quality)
+
+def encode_avif(img, quality, speed=0):
+    return encode_image(img, "AVIF", quality=quality, speed=speed)
+
+# 용량 우선 탐색용 빠른 인코더
+encode_webp_probe = partial(encode_webp, method=WEBP_PROBE_METHOD)
+encode_avif_probe = partial(encode_avif, speed=AVIF_PROBE_SPEED)
+
+def finish_probe(img, encode, quality, probe_data, max_kb, same_as_probe):
+    """탐색으로 고른 quality를 최종 설정으로 한 번 더 인코딩합니다.
+
+    최종 설정이 시험 인코딩과 같으면 그대로 쓰고, 최종 인코딩 결과가 max_kb를 넘으면
+    (드물지만 인코더 설정에 따라 가능) 조건을 만족하는 시험 인코딩 결과를 사용합니다.
+    """
+    if same_as_probe:
+        return probe_data
+    data = encode(img, quality)
+    return data if len(data) / 1024 <= max_kb else probe_data
+
+def predict_quality(estimate_size, max_bytes, low, high):
+    """예상 용량 함수 estimate_size(quality)로 max_bytes 이하가 되는 가장 높은 quality를
+    [low, high] 구간에서 예측합니다. (조건을 만족하는 값이 없으면 low)"""
+    predicted = low
+    while low <= high:
+        mid = (low + high) // 2
+        if estimate_size(mid) <= max_bytes:
+            predicted = mid
+            low = mid + 1
+        else:
+            high = mid - 1
+    return predicted
+
+def search_quality(img, encode, max_kb, stop_event=None, on_error=None, metrics=None, predict=False):
+    """용량 우선: max_kb 이하가 되는 가장 높은 quality를 찾습니다.
+
+    predict가 True이면 1/4로 축소한 이미지의 용량 곡선과 '원본/축소본 용량 비율'로 quality를 예측하고,
+    원본은 예측값 주변만 인코딩해 확인합니다. 비율은 고정된 기본값에서 시작해 이 이미지의 원본을 인코딩할
+    때마다 보정하므로, 결과는 다른 이미지나 처리 순서와 관계없습니다. 예측으로 몇 번 안에 좁혀지지 않으면
+    남은 구간을 이진 탐색합니다. (predict가 False이면 처음부터 이진 탐색)
+
+    예측 탐색에서는 확인하지 않은 quality가 PREDICT_TOLERANCE개 이하로 남으면 멈추므로, 결과는 전체 이진
+    탐색과 같거나 1 낮을 수 있습니다.
+
+    탐색 중 인코딩은 모두 메모리에서 수행하며, 가장 좋은 결과의 bytes를 그대로 돌려주므로
+    호출 측에서는 한 번만 파일로 쓰면 됩니다. on_error가 주어지면 인코딩 오류 시 on_error(예외)를 호출하고 탐색을 멈춥니다.
+    metrics가 주어지면 시험 인코딩 시간('probe_small', 'probe')과 횟수를 기록합니다.
+    반환값: (quality, bytes, 마지막 시도 quality) - 조건을 만족하는 quality가 없으면 (None, None, mid)
+    """
+    probe = timed_encoder(encode, metrics, "probe")
+    low, high = 10, 100
+    mid = None
+    best_quality, best_data = None, None
+    fail_quality, fail_size = None, None  # 용량을 넘긴 quality 중 가장 낮은 값
+
+    # 작은 이미지는 원본 인코딩이 충분히 빠르므로 예측 없이 이진 탐색
+    small = None
+    if predict and min(img.size) >= PREDICT_MIN_SIZE:
+        small = img.reduce(PREDICT_REDUCE_FACTOR)
+        probe_small = timed_encoder(encode, metrics, "probe_small")
+        small_sizes = {}
+        ratios = {}  # 원본을 인코딩한 quality -> 원본/축소본 용량 비율
+        default_ratio = (img.width * img.height) / (small.width * small.height) * PREDICT_DEFAULT_RATIO
+
+        def small_grid_size(quality):
+            if quality not in small_sizes:
+                small_sizes[quality] = len(probe_small(small, quality))
+            return small_sizes[quality]
+
+        def small_size(quality):
+            # 축소본은 PREDICT_SMALL_STEP 간격의 quality만 인코딩하고, 사이 값은 로그 용량으로 보간
+            below = quality - quality % PREDICT_SMALL_STEP
+            if below == quality:
+                return small_grid_size(quality)
+            above = below + PREDICT_SMALL_STEP
+            t = (quality - below) / PREDICT_SMALL_STEP
+            return math.exp(math.log(small_grid_size(below)) * (1 - t) + math.log(small_grid_size(above)) * t)
+
+        def estimate_size(quality):
+            # 용량 비율은 quality에 따라 조금씩 달라지므로, 확인된 두 지점 사이는 선형 보간
+            below = max((q for q in ratios if q <= quality), default=None)
+            above = min((q for q in ratios if q >= quality), default=None)
+            if below is None and above is None:
+                ratio = default_ratio
+            elif below is None or above is None or below == above:
+                ratio = ratios[above if below is None else below]
+            else:
+                t = (quality - below) / (above - below)
+                ratio = ratios[below] + (ratios[above] - ratios[below]) * t
+            return small_size(quality) * ratio
+
+    guided, step = 0, 1
+    while low <= high:
+        if small is not None and best_quality is not None and fail_quality is not None and high - low < PREDICT_TOLERANCE:
+            break
+
+        if stop_event is not None and stop_event.is_set():
+            return None, None, mid
+
+        try:
+            if small is not None and guided < PREDICT_MAX_PROBES:
+                if best_quality is not None and fail_quality is not None and fail_size > len(best_data):
+                    # 원본 기준으로 위/아래가 모두 확인되면 두 지점 사이를 로그 용량으로 보간
+                    # (올림으로 경계 바로 위를 먼저 확인해 한쪽 끝만 좁혀지는 것을 막음)
+                    t = math.log(max_kb * 1024 / len(best_data)) / math.log(fail_size / len(best_data))
+                    mid = min(max(best_quality + math.ceil(t * (fail_quality - best_quality)), low), high)
+                else:
+                    mid = predict_quality(estimate_size, max_kb * 1024, low, high)
+                    # 한쪽만 확인된 상태에서 예측이 조금씩만 움직이면 보폭을 두 배씩 늘림
+                    if best_quality is not None:
+                        mid = min(max(mid, best_quality + step), high)
+                    elif fail_quality is not None:
+                        mid = max(min(mid, fail_quality - step), low)
+                    if best_quality is not None or fail_quality is not None:
+                        step *= 2
+                guided += 1
+            else:
+                mid = (low + high) // 2
+            data = probe(img, mid)
+        except Exception as e:
+            if on_error is None:
+                raise
+            on_error(e)
+            break
+
+        if small is not None:
+            ratios[mid] = len(data) / small_size(mid)  # 실제 원본 용량으로 비율 보정
+
+        if len(data) / 1024 <= max_kb:
+            best_quality, best_data = mid, data
+            low = mid + 1
+        else:
+            fail_quality, fail_size = mid, len(data)
+            high = mid - 1
+
+    return best_quality, best_data, mid
+
+def write_bytes(output_path, data):
+    with open(output_path, "wb") as f:
+        f.write(data)
+
+def compress_and_save(img, output_path, format_name, min_quality, max_kb, mode, stop_event=None, log=print, effort=DEFAULT_EFFORT,
+                      metrics=None):
+    """이미지를 출력 형식으로 압축하여 저장하고, 결과 메시지를 반환합니다. (실패하면 False 또는 None)
+
+    인코딩은 메모리에서 하고 파일에는 한 번만 씁니다. metrics(new_metrics)가 주어지면 인코딩/쓰기 시간과
+    인코딩 횟수, 출력 용량을 기록합니다.
+    """
+    def encode_once(encode, *args, **params):
+        return timed_encoder(encode, metrics, "encode")(*args, **params)
+
+    def save(data):
+        with timed(metrics, "write"):
+            write_bytes(output_path, data)
+        if metrics is not None:
+            metrics["bytes_out"] = len(data)
+        return len(data) / 1024
+
+    if format_name in ["JPEG", "JPG"]:
+        if mode == 1:
+            size_kb = save(encode_once(encode_jpeg, img, min_quality))
+            return f"[화질 우선] quality={min_quality}, size={round(size_kb)}KB"
+        else:
+            best_quality, data, mid = search_quality(img, encode_jpeg, max_kb, stop_event, metrics=metrics,
+                                                     predict=PREDICT_FORMATS["JPEG"])
+            if stop_event is not None and stop_event.is_set():
+                return
+
+            if best_quality:
+                save(data)
+                return f"[용량 우선] quality={best_quality}, size={round(len(data) / 1024)}KB"
+            else:
+                return f"최적 품질 찾기 실패 (마지막 시도: quality={mid})"
+
+    elif format_name == "PNG":
+        compress_level = 9
+        size_kb = save(encode_once(encode_png, img, compress_level))
+        return f"[무손실] compress_level={compress_level}, size={round(size_kb)}KB"
+
+    elif format_name == "WebP":
+        if mode == 1:
+            size_kb = save(encode_once(encode_webp, img, min_quality, method=WEBP_METHOD[effort]))
+            return f"[화질 우선] quality={min_quality}, size={round(size_kb)}KB"
+        else:
+            best_quality, data, mid = search_quality(img, encode_webp_probe, max_kb, stop_event, metrics=metrics,
+                                                     predict=PREDICT_FORMATS["WebP"])
+            if stop_event is not None and stop_event.is_set():
+                return
+
+            if best_quality:
+                data = finish_probe(img, timed_encoder(partial(encode_webp, method=WEBP_METHOD[effort]), metrics, "encode"),
+                                    best_quality, data, max_kb, WEBP_METHOD[effort] == WEBP_PROBE_METHOD)
+                save(data)
+                return f"[용량 우선] quality={best_quality}, size={round(len(data) / 1024)}KB"
+
+    elif format_name == "AVIF":
+        if mode == 1:
+            try:
+                size_kb = save(encode_once(encode_avif, img, min_quality, speed=AVIF_SPEED[effort]))
+                return f"[화질 우선] quality={min_quality}, size={round(size_kb)}KB"
+            except Exception as e:
+                log(f"AVIF 저장 실패: {e}")
+                return False
+        else:
+            best_quality, data, mid = search_quality(img, encode_avif_probe, max_kb, stop_event,
+                                                     on_error=lambda e: log(f"AVIF 저장 실패: {e}"), metrics=metrics,
+                                                     predict=PREDICT_FORMATS["AVIF"])
+            if stop_event is not None and stop_event.is_set():
+                return
+
+            if best_quality:
+                try:
+                    data = finish_probe(img, timed_encoder(partial(encode_avif, speed=AVIF_SPEED[effort]), metrics, "encode"),
+                                        best_quality, data, max_kb, AVIF_SPEED[effort] == AVIF_PROBE_SPEED)
+                except Exception as e:
+                    log(f"AVIF 저장 실패: {e}")
+                save(data)
+                return f"[용량 우선] quality={best_quality}, size={round(len(data) / 1024)}KB"
+
+    elif format_name == "TIFF":
+        try:
+            size_kb = save(encode_once(encode_image, img, "TIFF", compression="tiff_lzw"))
+            return f"compression=tiff_lzw, size={round(size_kb)}KB"
+        except Exception as e:
+            log(f"TIFF 저장 실패: {e}")
+            return False
+
+    elif format_name == "BMP":
+        try:
+            size_kb = save(encode_once(encode_image, img, "BMP"))
+            return f"[무압축] size={round(size_kb)}KB"
+        except Exception as e:
+            log(f"BMP 저장 실패: {e}")
+            return False
+
+    else:
+        try:
+            size_kb = save(encode_once(encode_image, img, format_name))
+            return f"[무압축] size={round(size_kb)}KB"
+        except Exception as e:
+            log(f"저장 실패 ({format_name}): {e}")
+            return False
+
+def _init_worker(stop_event):
+    """프로세스 풀 작업자 초기화: 중지 이벤트를 전역으로 보관합니다.
+
+    glibc에서는 큰 할당(이미지 픽셀 블록)이 항상 mmap을 쓰도록 고정하여, 큰 이미지를 처리한 작업자가
+    해제한 메모리를 계속 붙잡고 있지 않게 합니다. (메모리 한도 계산이 실제 사용량과 맞도록)
+    """
+    global _worker_stop_event
+    _worker_stop_event = stop_event
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None)
+        libc.mallopt(M_MMAP_THRESHOLD, WORKER_MMAP_THRESHOLD)
+    except (OSError, AttributeError, TypeError):  # glibc가 아닌 환경 (Windows, macOS 등)
+        pass
+
+def default_cache_dir():
+    return os.path.join(os.path.expanduser("~"), ".k-imageresizer", "cache")
+
+def file_digest(path):
+    """파일 내용의 SHA-256 해시 (1MB 단위로 읽음)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def cache_path(cache_dir, input_file, fingerprint, output_path):
+    """원본 내용 해시와 설정으로 캐시 파일 경로를 만듭니다. (하위 폴더 256개로 분산)"""
+    key = hashlib.sha256(f"{ENCODE_CACHE_VERSION}|{file_digest(input_file)}|{fingerprint}".encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, key[:2], key + os.path.splitext(output_path)[1].lower())
+
+def link_or_copy(src, dst):
+    """같은 드라이브면 하드링크, 아니면 복사합니다."""
+    if os.path.lexists(dst):
+        os.remove(dst)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+def clone_file(src, dst):
+    """src를 dst로 커널 안에서 복제하고 사용한 방법('reflink' 또는 'copy')을 반환합니다. (지원하지 않으면 None)
+
+    FICLONE은 데이터 블록을 공유하므로 쓰기가 없고, 안 되면 copy_file_range로 사용자 공간을 거치지 않고 복사합니다.
+    (copy_file_range도 파일 시스템에 따라 reflink나 서버 측 복사로 처리됨)
+    """
+    if fcntl is None or not hasattr(os, "copy_file_range"):
+        return None
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            return "reflink"
+        except OSError:
+            pass
+        try:
+            remaining = os.fstat(fsrc.fileno()).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+        except OSError:
+            return None
+        # 중간에 멈췄으면(원본이 복사 도중 줄어든 경우 등) 잘린 파일이므로 None → 호출 측에서 일반 복사로 다시 씀
+        return "copy" if remaining <= 0 else None
+
+def copy_original(src, dst, strategy=DEFAULT_COPY_STRATEGY):
+    """원본을 dst에 strategy 방식으로 저장하고, 실제로 사용한 방법('copy', 'reflink', 'hardlink')을 반환합니다.
+
+    hardlink는 데이터를 쓰지 않지만 원본과 같은 파일이 되므로, 이후 다시 저장할 때는 unlink_if_hardlinked로 먼저 분리합니다.
+    """
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        raise shutil.SameFileError(f"{src!r}와 {dst!r}는 같은 파일입니다")
+    if strategy == "hardlink":
+        if os.path.lexists(dst):
+            os.remove(dst)
+        try:
+            os.link(src, dst)
+            return "hardlink"
+        except OSError:
+            pass  # 다른 드라이브 또는 하드 링크를 지원하지 않는 파일 시스템
+    elif strategy == "reflink":
+        method = clone_file(src, dst)
+        if method is not None:
+            shutil.copystat(src, dst)
+            return method
+        if os.path.lexists(dst):
+            os.remove(dst)  # 복제에 실패하며 남은 빈 파일 또는 잘린 파일
+    shutil.copy2(src, dst)
+    return "copy"
+
+def unlink_if_hardlinked(path):
+    """캐시와 하드링크된 출력 파일은 덮어쓰면 캐시 내용도 바뀌므로, 쓰기 전에 연결을 끊습니다."""
+    try:
+        if os.stat(path).st_nlink > 1:
+            os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def store_in_cache(output_path, cached_path):
+    """출력 파일을 캐시에 저장합니다. (다른 작업자와 겹치지 않도록 임시 파일로 복사 후 교체)"""
+    os.makedirs(os.path.dirname(cached_path), exist_ok=True)
+    temp_path = f"{cached_path}.{os.getpid()}.tmp"
+    shutil.copyfile(output_path, temp_path)
+    os.replace(temp_path, cached_path)
+
+def trim_cache(cache_dir, max_mb):
+    """캐시 용량이 max_mb를 넘으면 가장 오래 사용하지 않은(수정 시각 기준) 파일부터 삭제합니다."""
+    entries = []
+    for sub in os.scandir(cache_dir):
+        if sub.is_dir():
+            for entry in os.scandir(sub.path):
+                if entry.is_file():
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_mb * 1024 * 1024:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+class ProcessingError(Exception):
+    """이미지 처리에 실패한 단계와 원래 예외의 종류/메시지 (프로세스 풀 작업자에서 그대로 전달할 수 있도록 문자열로 보관)"""
+    def __init__(self, stage, error_type, message):
+        super().__init__(stage, error_type, message)
+        self.stage = stage
+        self.error_type = error_type
+        self.message = message
+
+    @classmethod
+    def wrap(cls, stage, error):
+        return cls(stage, type(error).__name__, str(error))
+
+    def __str__(self):
+        return self.message
+
+class FailureReport:
+    """실패한 파일 목록 (경로, 단계, 예외 종류, 메시지)
+
+    처리를 멈추지 않고 실패를 모아 두었다가, 끝난 뒤 한 번에 보여 주거나 JSON/CSV로 저장합니다.
+    여러 스레드에서 함께 add 할 수 있습니다.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.failures = []
+
+    def __len__(self):
+        return len(self.failures)
+
+    def add(self, path, stage, error):
+        """실패를 기록합니다. error가 ProcessingError면 그 단계와 원래 예외 정보를 사용합니다. (문자열이면 메시지로 사용)"""
+        if isinstance(error, ProcessingError):
+            failure = Failure(path, error.stage, error.error_type, error.message)
+        elif isinstance(error, BaseException):
+            failure = Failure(path, stage, type(error).__name__, str(error))
+        else:
+            failure = Failure(path, stage, "", str(error))
+        with self.lock:
+            self.failures.append(failure)
+
+    def summary(self, limit=10):
+        """'파일 이름 - 단계: 메시지' 형태로 앞의 limit개를 보여 주는 문자열"""
+        with self.lock:
+            failures = list(self.failures)
+        lines = [f"{os.path.basename(f.path)} - {STAGE_LABELS.get(f.stage, f.stage)}: {f.message}" for f in failures[:limit]]
+        if len(failures) > limit:
+            lines.append(f"... 외 {len(failures) - limit}개")
+        return "\n".join(lines)
+
+    def save(self, path):
+        """확장자가 .csv면 CSV(Excel에서 열 수 있도록 BOM 포함), 아니면 JSON으로 저장합니다."""
+        with self.lock:
+            rows = [f._asdict() for f in self.failures]
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        if path.lower().endswith(".csv"):
+            with open(path, "w", encoding="utf-8-sig", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=Failure._fields)
+                writer.writeheader()
+                writer.writerows(rows)
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(rows, f, ensure_ascii=False, indent=1)
+
+def prepare_output_path(input_file, output_folder, output_format):
+    """출력 파일 경로를 정하고 출력 폴더를 만듭니다. (인코딩 캐시와 하드 링크된 이전 결과는 먼저 분리)"""
+    os.makedirs(output_folder, exist_ok=True)
+    if output_format == KEEP_FORMAT:
+        output_name = os.path.basename(input_file)
+    else:
+        output_name = os.path.splitext(os.path.basename(input_file))[0] + "." + output_format.lower()
+
+    output_path = os.path.join(output_folder, output_name)
+    output_path = normalize_extension(output_path, output_format)
+    if os.path.abspath(output_path) != os.path.abspath(input_file):
+        unlink_if_hardlinked(output_path)
+    return output_path
+
+def copy_image_file(input_file, output_folder, output_format, copy_strategy=DEFAULT_COPY_STRATEGY):
+    """처리 계획에서 원본 복사로 분류된 이미지를 열지 않고 그대로 저장합니다.
+
+    반환값은 process_image_file과 같은 형태이며, 메시지 자리에는 실제로 사용한 복사 방법이 들어갑니다.
+    """
+    metrics = new_metrics()
+    output_path = prepare_output_path(input_file, output_folder, output_format)
+    with timed(metrics, "copy"):
+        method = copy_original(input_file, output_path, copy_strategy)
+    metrics["bytes_in"] = metrics["bytes_out"] = os.path.getsize(input_file)
+    return 'copy', method, output_path, [], metrics
+
+def run_plan_item(item, options, stop_event=None):
+    """처리 계획 항목 하나를 실행합니다. (원본 복사는 바로 복사하고, 열 수 없는 파일은 계획 때의 예외를 다시 발생)"""
+    if item.action == 'unsupported':
+        raise ProcessingError.wrap('open', item.error)
+    if item.action == 'copy':
+        try:
+            return copy_image_file(item.input_file, item.output_folder, options[3], options[7])
+        except Exception as e:
+            raise ProcessingError.wrap('copy', e) from e
+    return process_image_file(item.input_file, item.output_folder, *options, stop_event=stop_event)
+
+def process_image_file(input_file, output_folder, max_width, min_quality, max_size_kb, output_format, mode, effort=DEFAULT_EFFORT,
+                       cache_dir=None, copy_strategy=DEFAULT_COPY_STRATEGY, stop_event=None):
+    """이미지 한 장을 열고 회전 보정/리사이즈/압축하여 저장합니다. (프로세스 풀 작업자에서도 실행됨)
+
+    cache_dir가 주어지면 디코딩 전에 인코딩 캐시를 확인하여, 같은 원본/설정의 결과가 있으면 그대로 사용합니다.
+    반환값: (상태, 메시지, 출력 경로, 로그 목록, 처리 통계) - 상태는 'copy', 'cache', 'ok', 'fail' 중 하나,
+    처리 통계는 new_metrics 형태입니다. 실패하면 실패한 단계를 담은 ProcessingError를 발생시킵니다.
+    """
+    if stop_event is None:
+        stop_event = _worker_stop_event
+
+    notes = []
+    metrics = new_metrics()
+    stage = 'save'  # 실패 시 ProcessingError로 알릴 단계
+    try:
+        output_path = prepare_output_path(input_file, output_folder, output_format)
+
+        stage = 'open'
+        with timed(metrics, "open"):
+            img = PILImage.open(input_file)
+            metrics["bytes_in"] = os.path.getsize(input_file)
+        with img:
+            # ✅ 원본 유지 조건: 입/출력 동일 형식 & 너비,용량 모두 기준 이하 (헤더 정보만으로 판단)
+            original_width = displayed_size(img)[0]
+            output_ext, output_format_ = output_format_for(input_file, output_format, img.format)
+
+            if is_copy_through(input_file, output_ext, original_width, metrics["bytes_in"], max_width, max_size_kb):
+                stage = 'copy'
+                with timed(metrics, "copy"):
+                    method = copy_original(input_file, output_path, copy_strategy)
+                metrics["bytes_out"] = metrics["bytes_in"]
+                return 'copy', method, output_path, notes, metrics
+
+            cached_path = None
+            if cache_dir:
+                stage = 'cache'
+                fingerprint = settings_fingerprint(max_width, min_quality, max_size_kb, output_format, mode, effort)
+                cached_path = cache_path(cache_dir, input_file, fingerprint, output_path)
+                if os.path.isfile(cached_path):
+                    with timed(metrics, "cache"):
+                        link_or_copy(cached_path, output_path)
+                        os.utime(cached_path)  # 최근 사용 표시 (캐시 정리 시 LRU 기준)
+                    metrics["bytes_out"] = os.path.getsize(output_path)
+                    return 'cache', f"[캐시] size={round(metrics['bytes_out'] / 1024)}KB", output_path, notes, metrics
+
+            # 먼저 (축소 배율로 디코딩해) 줄인 뒤 회전 보정하고, 인코더가 요구할 때만 모드를 변환 (원본 크기의 복사본을 만들지 않음)
+            stage = 'decode'
+            metrics["megapixels_in"] = img.width * img.height / 1e6
+            with timed(metrics, "decode"):
+                draft_for_width(img, max_width)
+                img.load()
+            orientation = img.getexif().get(EXIF_ORIENTATION)  # 디코딩 후라 다시 읽지 않음 (PNG는 픽셀 뒤의 eXIf 청크까지 반영)
+            with timed(metrics, "resize"):
+                img = resize_image_keep_ratio(img, max_width, orientation in ROTATED_ORIENTATIONS)
+            with timed(metrics, "transpose"):
+                img = apply_orientation(img, orientation)
+            with timed(metrics, "convert"):
+                img = convert_for_encoder(img, output_format_)
+            metrics["megapixels_out"] = img.width * img.height / 1e6
+
+            stage = 'encode'
+            success = compress_and_save(img, output_path, output_format_, min_quality, max_size_kb, mode, stop_event, notes.append, effort,
+                                        metrics)
+    except Exception as e:
+        raise ProcessingError.wrap(stage, e) from e
+
+    if success and cached_path:
+        try:
+            store_in_cache(output_path, cached_path)
+        except OSError as e:
+            notes.append(f"캐시 저장 실패: {e}")
+
+    return ('ok' if success else 'fail'), success, output_path, notes, metrics
+
+def iter_image_results(plan, options, jobs=1, stop_event=None, memory_budget_mb=None):
+    """파일별 처리 결과를 입력 순서대로 돌려주는 제너레이터입니다.
+
+    plan은 PlanItem을 내보내는 이터러블이며, 목록 전체를 미리 만들 필요가 없습니다.
+    jobs가 2 이상이면 인코딩할 이미지만 프로세스 풀에서 병렬로 처리하고(원본 복사는 이 프로세스에서 바로 처리),
+    결과는 입력 순서대로 내보냅니다. memory_budget_mb가 주어지면 풀에 넣은 이미지들의 예상 메모리
+    (estimate_image_memory) 합계가 한도를 넘지 않게 하며, 한도보다 큰 이미지는 다른 이미지 없이 혼자 처리합니다.
+    (idx, 입력 파일, 결과, 예외) 형태로 yield 하며, 중지 요청 시 대기 중인 작업은 취소됩니다.
+    작업자 프로세스가 비정상 종료되면(메모리 부족으로 강제 종료 등) 그 풀에 넣었던 작업은 'worker' 단계의
+    ProcessingError로 알리고, 이후 작업은 새 풀에서 계속 처리합니다.
+    """
+    if jobs <= 1:
+        for idx, item in enumerate(plan):
+            if stop_event is not None and stop_event.is_set():
+                return
+            try:
+                result, error = run_plan_item(item, options, stop_event), None
+            except Exception as e:
+                result, error = None, e
+            # 처리 중에 중지된 파일은 실패로 알리지 않음 (병렬 처리와 같음)
+            if stop_event is not None and stop_event.is_set():
+                return
+            yield idx, item.input_file, result, error
+        return
+
+    # 대기열은 작업자 수의 2배까지만 채워서 중지 요청 시 취소할 작업이 많지 않게 함
+    pending = deque()
+    items = enumerate(plan)
+    budget = memory_budget_mb * 1024 * 1024 if memory_budget_mb else None
+    in_flight = 0   # 대기열에 넣은 인코딩 작업의 예상 메모리 합계 (결과를 꺼낼 때 뺌)
+    waiting = None  # 메모리 한도 때문에 아직 넣지 못한 작업
+    executor = None
+    try:
+        while True:
+            while len(pending) < jobs * 2 and not (stop_event is not None and stop_event.is_set()):
+                next_item = waiting or next(items, None)
+                if next_item is None:
+                    break
+                idx, item = next_item
+                memory = estimate_image_memory(item.info, options[0]) if budget and item.action == 'encode' else 0
+                if in_flight and in_flight + memory > budget:
+                    waiting = next_item  # 앞선 작업이 끝나 메모리가 확보될 때까지 대기 (입력 순서 유지)
+                    break
+                waiting = None
+                in_flight += memory
+                pool = None
+                if item.action == 'encode':
+                    if executor is None:
+                        executor = ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(stop_event,))
+                    pool = executor
+                    try:
+                        future = executor.submit(process_image_file, item.input_file, item.output_folder, *options)
+                    except BrokenProcessPool as e:
+                        future = Future()
+                        future.set_exception(e)
+                else:
+                    future = Future()
+                    try:
+                        future.set_result(run_plan_item(item, options))
+                    except Exception as e:
+                        future.set_exception(e)
+                pending.append((idx, item.input_file, future, memory, pool))
+
+            if not pending:
+                return
+
+            idx, input_file, future, memory, pool = pending.popleft()
+            try:
+                result, error = future.result(), None
+            except BrokenProcessPool as e:
+                # 작업자가 비정상 종료됨 (메모리 부족으로 강제 종료 등): 이 풀에 넣은 작업은 모두 실패로 알리고,
+                # 이후 작업은 새 풀에서 계속 처리
+                result, error = None, ProcessingError("worker", type(e).__name__,
+                                                      f"작업 프로세스가 비정상 종료됨 (메모리 부족 등): {e}")
+                if pool is executor:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    executor = None
+            except Exception as e:
+                result, error = None, e
+            in_flight -= memory
+
+            if stop_event is not None and stop_event.is_set():
+                return
+            yield idx, input_file, result, error
+    finally:
+        for _, _, future, _, _ in pending:
+            future.cancel()
+        if executor is not None:
+            executor.shutdown()
+
+
+def load_manifest(output_folder):
+    """출력 폴더의 처리 기록을 읽습니다. (없거나 손상되었으면 빈 기록)"""
+    try:
+        with open(os.path.join(output_folder, MANIFEST_FILE), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(output_folder, manifest):
+    """처리 기록을 임시 파일에 쓴 뒤 교체하여, 중간에 중단되어도 기록이 깨지지 않게 합니다."""
+    manifest_path = os.path.join(output_folder, MANIFEST_FILE)
+    with open(manifest_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(manifest_path + ".tmp", manifest_path)
+
+def settings_fingerprint(*options):
+    """출력 결과에 영향을 주는 설정 값들을 하나의 문자열로 만듭니다."""
+    return json.dumps(options, ensure_ascii=False)
+
+def source_signature(input_file):
+    stat = os.stat(input_file)
+    return stat.st_size, stat.st_mtime_ns
+
+def is_unchanged(manifest, input_file, fingerprint):
+    """원본(크기, 수정 시각)과 설정이 기록과 같고 출력 파일도 남아 있으면 True"""
+    entry = manifest.get(os.path.abspath(input_file))
+    if not entry or entry["settings"] != fingerprint:
+        return False
+    try:
+        size, mtime_ns = source_signature(input_file)
+    except OSError:
+        return False
+    return entry["size"] == size and entry["mtime_ns"] == mtime_ns and os.path.isfile(entry["output"])
+
+def percentile(sorted_values, p):
+    """정렬된 값 목록의 p 백분위수 (최근접 순위 방식, 빈 목록이면 0)"""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(p / 100 * len(sorted_values))
+    return sorted_values[min(len(sorted_values), max(1, rank)) - 1]
+
+def summarize_metrics(metrics_list, elapsed):
+    """이미지별 처리 통계(new_metrics)를 배치 통계로 요약합니다.
+
+    단계별 통계는 그 단계를 거친 이미지 수, 합계, p50/p95(초)이며, 병렬 처리 시 합계는 경과 시간보다 클 수 있습니다.
+    """
+    stages = {}
+    for metrics in metrics_list:
+        for stage, seconds in metrics["seconds"].items():
+            stages.setdefault(stage, []).append(seconds)
+
+    count = len(metrics_list)
+    megapixels = sum(metrics["megapixels_in"] for metrics in metrics_list)
+    encodes = sum(metrics["encodes"] for metrics in metrics_list)
+    small_encodes = sum(metrics["small_encodes"] for metrics in metrics_list)
+    return {
+        "images": count,
+        "elapsed_seconds": elapsed,
+        "images_per_second": count / elapsed if elapsed > 0 else 0.0,
+        "megapixels_per_second": megapixels / elapsed if elapsed > 0 else 0.0,
+        "megapixels_in": megapixels,
+        "megapixels_out": sum(metrics["megapixels_out"] for metrics in metrics_list),
+        "bytes_in": sum(metrics["bytes_in"] for metrics in metrics_list),
+        "bytes_out": sum(metrics["bytes_out"] for metrics in metrics_list),
+        "encodes": encodes,
+        "encodes_per_image": encodes / count if count else 0.0,
+        "small_encodes": small_encodes,
+        "small_encodes_per_image": small_encodes / count if count else 0.0,
+        "stages": {
+            stage: {"count": len(values), "total": sum(values), "p50": percentile(values, 50), "p95": percentile(values, 95)}
+            for stage, values in ((stage, sorted(values)) for stage, values in stages.items())
+        },
+    }
+
+def format_batch_report(report):
+    """summarize_metrics 결과를 로그에 남길 두 줄로 만듭니다. (단계는 합계가 큰 순서)"""
+    mb = 1024 * 1024
+    lines = [
+        f"⏱ 처리 통계: {report['images']}장, {report['elapsed_seconds']:.1f}초 "
+        f"({report['images_per_second']:.1f}장/초, {report['megapixels_per_second']:.1f}MP/초), "
+        f"입력 {report['bytes_in'] / mb:,.1f}MB → 출력 {report['bytes_out'] / mb:,.1f}MB, "
+        f"인코딩 {report['encodes']}회 (장당 {report['encodes_per_image']:.1f}회)"
+        + (f", 축소본 시험 인코딩 {report['small_encodes']}회 (장당 {report['small_encodes_per_image']:.1f}회)"
+           if report["small_encodes"] else "")
+    ]
+    stages = sorted(report["stages"].items(), key=lambda item: item[1]["total"], reverse=True)
+    if stages:
+        lines.append("⏱ 단계별 시간 (p50/p95 ms): " + ", ".join(
+            f"{TIMING_LABELS.get(stage, stage)} {s['p50'] * 1000:.0f}/{s['p95'] * 1000:.0f}" for stage, s in stages))
+    return "\n".join(lines)
+
+def process_images(input_paths, output_folder, max_width, min_quality, max_size_kb, output_format, mode, jobs=1,
+                   stop_event=None, log=print, on_progress=None, on_error=None, effort=DEFAULT_EFFORT, incremental=False,
+                   cache_dir=None, cache_max_mb=DEFAULT_CACHE_MB, stats=None, recursive=False, dry_run=False,
+                   copy_strategy=DEFAULT_COPY_STRATEGY, failures=None, report_file=None, memory_budget_mb=None):
+    """입력 경로의 이미지들을 일괄 처리하고, 처리된 이미지 수를 반환합니다.
+
+    폴더 탐색과 헤더 확인으로 세운 처리 계획(원본 복사/인코딩/열 수 없음)은 별도 스레드에서 만들어지는 대로 바로
+    처리하므로 첫 파일부터 처리가 시작되며, 예상 작업량은 계획을 다 세운 시점에 log로 알립니다.
+    (dry_run이면 계획만 세우고 처리하지 않음) recursive이면 하위 폴더까지 탐색해 출력 폴더에 같은 폴더 구조로 저장합니다.
+    log(메시지)로 파일별 결과를, on_progress(완료 수, 전체 수)로 진행 상황을 알리며 (전체 수는 지금까지 계획한 수),
+    처리 중 예외가 발생하면 on_error(idx, 입력 파일, 예외)를 호출하고 다음 파일로 넘어갑니다.
+    failures(FailureReport)가 주어지면 실패한 파일을 단계와 함께 기록합니다. (처리는 멈추지 않음)
+    원본 그대로 저장할 이미지는 copy_strategy('copy', 'reflink', 'hardlink') 방식으로 저장합니다.
+    incremental이면 출력 폴더의 처리 기록과 비교해 원본과 설정이 그대로인 이미지는 건너뜁니다.
+    cache_dir가 주어지면 인코딩 캐시를 사용하고(끝나면 cache_max_mb 이하로 정리), stats 사전이 주어지면
+    캐시 적중/미적중 수('cache_hits', 'cache_misses')와 예상 작업량('plan', estimate_workload 참고)을 채웁니다.
+    끝나면 단계별 처리 시간 등 배치 통계를 log로 알리고 stats['report']에 넣으며(summarize_metrics 참고),
+    report_file이 주어지면 JSON으로도 저장합니다.
+    병렬 처리 시 동시에 처리하는 이미지들의 예상 메모리 합계는 memory_budget_mb 이하로 유지합니다.
+    (None이면 default_memory_budget_mb, 0이면 제한 없음)
+    """
+    processed = 0
+    skipped = 0
+    if stats is None:
+        stats = {}
+    stats.update(cache_hits=0, cache_misses=0)
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+
+    manifest = None
+    # recursive는 출력 경로 구조(하위 폴더 유지 여부)를 바꾸므로 처리 기록 비교에 포함
+    fingerprint = settings_fingerprint(max_width, min_quality, max_size_kb, output_format, mode, effort, recursive)
+    if incremental:
+        manifest = load_manifest(output_folder)
+
+    def pending_files():
+        nonlocal skipped
+        for input_file, relative in scan_image_files(input_paths, recursive, exclude=[output_folder]):
+            if manifest is not None and is_unchanged(manifest, input_file, fingerprint):
+                skipped += 1
+                continue
+            yield input_file, os.path.join(output_folder, relative)
+
+    # 처리 계획: 탐색과 헤더 확인은 별도 스레드에서 진행하며, 계획한 항목은 바로 처리에 넘김
+    # (예상 작업량은 계획을 다 세운 뒤 알리므로, 계획보다 처리가 먼저 시작됨)
+    start = time.perf_counter()
+    plan = []  # 지금까지 세운 계획 (탐색 스레드에서 추가)
+    plan_done = threading.Event()
+    plan_times = {}
+
+    def planning():
+        for item in plan_images(pending_files(), max_width, max_size_kb, output_format):
+            plan.append(item)
+            yield item
+        plan_times["seconds"] = time.perf_counter() - start
+        plan_done.set()
+
+    def log_plan():
+        workload = estimate_workload(plan, max_width, output_format, mode, effort, jobs)
+        stats["plan"] = workload
+        unsupported = f", 열 수 없음 {workload['unsupported']}개" if workload['unsupported'] else ""
+        log(f"📋 처리 계획: 인코딩 {workload['encode']}개, 원본 복사 {workload['copy']}개{unsupported}"
+            f" (디코딩 {workload['decode_mp']:,.1f}MP, 인코딩 {workload['encode_mp']:,.1f}MP)"
+            f" - 예상 시간 약 {format_duration(workload['seconds'])}")
+
+    if memory_budget_mb is None:
+        memory_budget_mb = default_memory_budget_mb()
+    if jobs > 1 and memory_budget_mb and not dry_run:
+        log(f"🧠 메모리 한도 {memory_budget_mb:,}MB: 동시에 처리하는 이미지의 예상 메모리 합계가 한도를 넘지 않게 조절")
+
+    planned = iter_in_background(planning(), {})
+    if dry_run:
+        try:
+            for _ in planned:
+                if stop_event is not None and stop_event.is_set():
+                    return 0
+        finally:
+            planned.close()
+        log_plan()
+        return 0
+
+    metrics_list = []
+    plan_logged = False
+    try:
+        options = (max_width, min_quality, max_size_kb, output_format, mode, effort, cache_dir, copy_strategy)
+        for idx, input_file, result, error in iter_image_results(planned, options, jobs, stop_event, memory_budget_mb):
+            if not plan_logged and plan_done.is_set():
+                log_plan()
+                plan_logged = True
+
+            if error is None:
+                status, success, output_path, notes, metrics = result
+                metrics_list.append(metrics)
+                for note in notes:
+                    log(note)
+
+                if manifest is not None and status != 'fail':
+                    size, mtime_ns = source_signature(input_file)
+                    manifest[os.path.abspath(input_file)] = {
+                        "size": size, "mtime_ns": mtime_ns, "settings": fingerprint, "output": output_path,
+                    }
+
+                if status == 'copy':
+                    processed += 1
+                    log(f"{idx+1}. ⮕ ✅ {COPY_METHOD_LABELS[success]}:			{os.path.basename(output_path)}")
+                elif status == 'cache':
+                    processed += 1
+                    stats["cache_hits"] += 1
+                    log(f"{idx+1}. ⮕ ♻ {success}:	{os.path.basename(output_path)}")
+                elif status == 'ok':
+                    processed += 1
+                    if cache_dir:
+                        stats["cache_misses"] += 1
+                    log(f"{idx+1}. ⮕ {success}:	{os.path.basename(output_path)}")
+                else:
+                    log(f"{idx+1}. ⮕ ⚠️ 압축 실패: {input_file}")
+                    if failures is not None:
+                        failures.add(input_file, 'encode', "압축 실패")
+
+            else:
+                e_ = f"{error}".replace("\\\\", "\\")
+                log(f"{idx+1}. ⮕ ❌ 오류: {input_file} - {e_}")
+                if failures is not None:
+                    failures.add(input_file, 'decode', error)
+                if on_error:
+                    on_error(idx, input_file, error)
+
+            if on_progress:
+                on_progress(idx + 1, max(idx + 1, len(plan)))
+
+        if not plan_logged and plan_done.is_set():  # 처리할 항목이 없었던 경우
+            log_plan()
+        if skipped:
+            log(f"⏭ 변경 없는 이미지 {skipped}개 건너뜀")
+
+        report = summarize_metrics(metrics_list, time.perf_counter() - start)
+        report["plan_seconds"] = plan_times.get("seconds")
+        report["settings"] = {
+            "max_width": max_width, "min_quality": min_quality, "max_size_kb": max_size_kb, "output_format": output_format,
+            "mode": mode, "effort": effort, "jobs": jobs, "copy_strategy": copy_strategy, "memory_budget_mb": memory_budget_mb,
+        }
+        stats["report"] = report
+        if metrics_list:
+            log(format_batch_report(report))
+        if report_file:
+            try:
+                with open(report_file, "w", encoding="utf-8") as f:
+                    json.dump(report, f, ensure_ascii=False, indent=1)
+            except OSError as e:
+                log(f"❌ 처리 통계 저장 실패: {report_file} - {e}")
+    finally:
+        planned.close()
+        if manifest is not None:
+            save_manifest(output_folder, manifest)
+        if cache_dir:
+            trim_cache(cache_dir, cache_max_mb)
+
+    return processed
@@ -0,0 +1,172 @@
+# K-ImageResizer 이미지 뷰어용 썸네일/표시 이미지 생성 및 썸네일 디스크 캐시 (GUI 비의존)
+# 이미지 뷰어의 썸네일을 SQLite 파일에 보관해 두고, 같은 이미지를 다시 열 때 원본을 디코딩하지 않습니다.
+import io
+import os
+import sqlite3
+import threading
+import time
+from PIL import Image as PILImage, ImageOps, ExifTags
+
+from resizer_core import EXIF_ORIENTATION, ORIENTATION_TRANSPOSE, ROTATED_ORIENTATIONS, normalize_path, probe_image
+
+
+# 썸네일 캐시 최대 용량(MB)과 저장 화질 (JPEG)
+DEFAULT_THUMB_CACHE_MB = 256
+THUMB_CACHE_QUALITY = 90
+
+# EXIF IFD1(내장 썸네일)의 JPEG 위치/길이 태그
+EXIF_THUMB_OFFSET = 0x0201
+EXIF_THUMB_LENGTH = 0x0202
+
+
+def default_thumbnail_db():
+    return os.path.join(os.path.expanduser("~"), ".k-imageresizer", "thumbnails.db")
+
+def read_exif_thumbnail(img, size):
+    """JPEG에 내장된 EXIF 썸네일을 방향 보정하여 반환합니다.
+
+    내장 썸네일이 없거나, size보다 작거나, 원본과 가로세로 비율이 다르면(여백이 들어간 썸네일) None을 반환합니다.
+    """
+    raw = img.info.get("exif")
+    if img.format != "JPEG" or not raw:
+        return None
+
+    exif = img.getexif()
+    ifd1 = exif.get_ifd(ExifTags.IFD.IFD1)
+    offset, length = ifd1.get(EXIF_THUMB_OFFSET), ifd1.get(EXIF_THUMB_LENGTH)
+    if not offset or not length:
+        return None
+
+    start = offset + 6 if raw.startswith(b"Exif\x00\x00") else offset
+    try:
+        thumb = PILImage.open(io.BytesIO(raw[start:start + length]))
+        thumb.load()
+    except Exception:
+        return None
+
+    if thumb.width < size[0] and thumb.height < size[1]:
+        return None
+    if abs(thumb.width / thumb.height - img.width / img.height) > 0.02:
+        return None
+
+    transpose = ORIENTATION_TRANSPOSE.get(exif.get(EXIF_ORIENTATION))  # 내장 썸네일에는 방향 보정이 되어 있지 않음
+    return thumb.transpose(transpose) if transpose is not None else thumb
+
+def decode_thumbnail(path, size):
+    """썸네일을 ((너비, 높이), RGB 바이트)로 디코딩합니다. (작업 스레드에서 실행되므로 wx 객체는 만들지 않음)
+
+    EXIF 내장 썸네일을 쓸 수 있으면 원본을 디코딩하지 않고, 아니면 JPEG은 축소 배율로 디코딩합니다.
+    """
+    with PILImage.open(path) as img:
+        thumb = read_exif_thumbnail(img, size)
+        if thumb is None:
+            img.draft("RGB", size)
+            thumb = ImageOps.exif_transpose(img)
+        thumb.thumbnail(size)
+        thumb = thumb.convert("RGB")
+        return thumb.size, thumb.tobytes()
+
+def render_view_image(path, box, fast=False):
+    """뷰어 본문에 표시할 이미지를 box(너비, 높이) 안에 맞춰 만듭니다. (작업 스레드에서도 실행됨)
+
+    fast이면 빠른 미리보기용으로, JPEG은 축소 배율로 디코딩하고 reduce + BILINEAR로 줄입니다.
+    아니면 원본 해상도에서 LANCZOS로 줄입니다.
+    반환값: ((너비, 높이), RGB 바이트, (원본 너비, 원본 높이, 파일 크기, 형식))
+    """
+    info = probe_image(path)  # 해상도/용량/형식은 헤더 정보 (파일별 캐시)
+    file_format = (info.format or os.path.splitext(path)[1][1:].upper()).replace('JPG', 'JPEG').replace('WEBP', 'WebP')
+    with PILImage.open(path) as img:
+        original_width, original_height = info.width, info.height
+        scale = min(box[0] / original_width, box[1] / original_height, 1.0)
+        target = (max(1, int(original_width * scale)), max(1, int(original_height * scale)))
+
+        if fast:
+            rotated = info.orientation in ROTATED_ORIENTATIONS
+            img.draft("RGB", target[::-1] if rotated else target)
+            img = ImageOps.exif_transpose(img)
+            if img.mode not in ("RGB", "L"):  # 팔레트/CMYK 등은 reduce 전에 변환
+                img = img.convert("RGB")
+            factor = min(img.width // target[0], img.height // target[1])
+            if factor >= 2:
+                img = img.reduce(factor)
+            img = img.resize(target, PILImage.BILINEAR)
+        else:
+            img = ImageOps.exif_transpose(img)
+            img = img.resize(target, PILImage.LANCZOS)
+
+        img = img.convert("RGB")
+        return img.size, img.tobytes(), (original_width, original_height, info.file_size, file_format)
+
+class ThumbnailCache:
+    """썸네일 디스크 캐시 (SQLite 파일 하나)
+
+    (경로, 썸네일 크기)별로 원본의 크기/수정 시각과 JPEG으로 압축한 썸네일을 보관하며, 원본이 바뀌면 다시 만듭니다.
+    close() 때 max_mb를 넘으면 오래 사용하지 않은 썸네일부터 지웁니다. 여러 스레드에서 함께 사용할 수 있습니다.
+    """
+    def __init__(self, db_path=None, max_mb=DEFAULT_THUMB_CACHE_MB):
+        db_path = db_path or default_thumbnail_db()
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.max_mb = max_mb
+        self.lock = threading.Lock()
+        self.used = {}  # 이번에 캐시에서 읽은 항목 → 사용 시각 (close 때 한 번에 기록)
+
+        self.db = sqlite3.connect(db_path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS thumbnails ("
+            " path TEXT, width INTEGER, height INTEGER, size INTEGER, mtime_ns INTEGER, used REAL, data BLOB,"
+            " PRIMARY KEY (path, width, height))"
+        )
+        self.db.commit()
+
+    def load(self, path, thumb_size, decode=decode_thumbnail):
+        """캐시된 썸네일을 ((너비, 높이), RGB 바이트)로 반환합니다. 없거나 원본이 바뀌었으면 decode로 만들어 저장합니다."""
+        key = (normalize_path(path), thumb_size[0], thumb_size[1])
+        stat = os.stat(path)
+        with self.lock:
+            row = self.db.execute(
+                "SELECT size, mtime_ns, data FROM thumbnails WHERE path = ? AND width = ? AND height = ?", key
+            ).fetchone()
+
+        if row is not None and row[0] == stat.st_size and row[1] == stat.st_mtime_ns:
+            with PILImage.open(io.BytesIO(row[2])) as thumb:
+                thumb = thumb.convert("RGB")
+                with self.lock:
+                    self.used[key] = time.time()
+                return thumb.size, thumb.tobytes()
+
+        size, data = decode(path, thumb_size)
+        buffer = io.BytesIO()
+        PILImage.frombytes("RGB", size, data).save(buffer, format="JPEG", quality=THUMB_CACHE_QUALITY)
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO thumbnails VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (*key, stat.st_size, stat.st_mtime_ns, time.time(), buffer.getvalue()),
+            )
+            self.db.commit()
+        return size, data
+
+    def trim(self):
+        """캐시 용량이 max_mb를 넘으면 가장 오래 사용하지 않은 썸네일부터 삭제합니다."""
+        total = self.db.execute("SELECT COALESCE(SUM(LENGTH(data)), 0) FROM thumbnails").fetchone()[0]
+        if total <= self.max_mb * 1024 * 1024:
+            return
+
+        removed = []
+        for rowid, length in self.db.execute("SELECT rowid, LENGTH(data) FROM thumbnails ORDER BY used"):
+            if total <= self.max_mb * 1024 * 1024:
+                break
+            removed.append((rowid,))
+            total -= length
+        self.db.executemany("DELETE FROM thumbnails WHERE rowid = ?", removed)
+
+    def close(self):
+        with self.lock:
+            self.db.executemany(
+                "UPDATE thumbnails SET used = ? WHERE path = ? AND width = ? AND height = ?",
+                [(used, *key) for key, used in self.used.items()],
+            )
+            self.trim()
+            self.db.commit()
+            self.db.close()